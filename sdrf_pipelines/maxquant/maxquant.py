@@ -4,10 +4,13 @@ Created on Sun Apr 19 09:46:14 2020
 @author: ChengXin
 """
 
+import functools
 import os
 import re
-import time
+from collections import Counter
 from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
 from xml.dom.minidom import Document
 from xml.dom.minidom import parse
 
@@ -18,17 +21,48 @@ import pandas as pd
 import pkg_resources
 import yaml
 
+# Use the libyaml parser when PyYAML was built with it, the pure Python one is several times slower
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+@functools.lru_cache(maxsize=None)
+def load_param_mapping(param_file: str) -> dict:
+    """
+    Read the mapping between SDRF columns and MaxQuant parameters. The file ships with the package, so it is only
+    parsed once per process.
+    :param param_file: path to the param2sdrf.yml file
+    :return: dictionary SDRF column -> MaxQuant parameter name, shared between calls and must not be modified
+    """
+    with open(param_file) as file:
+        param_mapping = yaml.load(file, Loader=SafeLoader)
+    return {i["sdrf"]: i["name"] for i in param_mapping["parameters"]}
+
+
+def maxquant_timestamp() -> str:
+    """
+    Current UTC time followed by the offset of the local time zone, as written in the modification dates of the
+    MaxQuant configuration, e.g. 2024-01-31T10:20:30.12345+01:00
+    :return: timestamp
+    """
+    now = datetime.now(timezone.utc)
+    offset = now.astimezone().utcoffset()
+    sign = "+" if offset > timedelta(0) else "-"
+    return now.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-1] + sign + str(abs(offset)).zfill(8)[:5]
+
 
 class Maxquant:
     def __init__(self) -> None:
         super().__init__()
-        self.warnings = {}
+        self.warnings = Counter()
         self.modfile = pkg_resources.resource_filename(__name__, "modifications.xml")
         self.datparamfile = pkg_resources.resource_filename(__name__, "param2sdrf.yml")
 
     def guess_tmt(self, lt, label_list=None):
         warning_message = "guessing TMT from number of different labels"
-        self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+        self.warnings[warning_message] += 1
 
         if len(label_list) == 11:
             for i in label_list:
@@ -137,13 +171,13 @@ class Maxquant:
             aa_equal = False
             if "AC=UNIMOD" not in mod and "AC=Unimod" not in mod:
                 warning_message = "only UNIMOD modifications supported. skip" + mod
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 continue
 
             name = re.search("NT=(.+?)(;|$)", mod).group(1)
             if "Label:" in name:
                 warning_message = name + " Label modifications is Automatically supplemented by MaxQuant"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 continue
 
             if re.search("PP=(.+?)(;|$)", mod) is None:
@@ -155,7 +189,7 @@ class Maxquant:
             pp = pp.replace(" ", "").replace("-", "").lower()
             if re.search("TA=(.+?)(;|$)", mod) is None:
                 warning_message = "Warning no TA= specified."
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 aa = ["-"]
             else:
                 ta = re.search("TA=(.+?)(;|$)", mod).group(1)  # target amino-acid
@@ -169,7 +203,7 @@ class Maxquant:
                     aa = ta.split(",")  # multiply target site e.g., S,T,Y
             if re.search("CF=(.+?)(;|$)", mod) is None:
                 warning_message = "Warning no CF= specified.Please add manually"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 CF = ""
             else:
                 CF = re.search("CF=(.+?)(;|$)", mod).group(1).replace(" ", "").replace(")", ") ").rstrip()
@@ -177,7 +211,7 @@ class Maxquant:
             if name.lower().startswith("tmt"):
                 w = True
                 warning_message = "Warning no " + mod + " modification in MaxQuant.Supplement manuanly some parameters"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 modification = mod_local.createElement("modification")
                 if "-" in aa:
                     if pp == "anycterm":
@@ -194,19 +228,9 @@ class Maxquant:
 
                 modification.setAttribute("title", name)
                 modification.setAttribute("description", name + " modification")
-                now_stamp = time.time()
-                local_time = datetime.fromtimestamp(now_stamp)
-                utc_time = datetime.utcfromtimestamp(now_stamp)
-                if local_time > utc_time:
-                    offset = "+" + str(local_time - utc_time).zfill(8)[:5]
-                else:
-                    offset = "-" + str(utc_time - local_time).zfill(8)[:5]
-                modification.setAttribute(
-                    "create_date", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset
-                )
-                modification.setAttribute(
-                    "last_modified_date", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset
-                )
+                timestamp = maxquant_timestamp()
+                modification.setAttribute("create_date", timestamp)
+                modification.setAttribute("last_modified_date", timestamp)
                 modification.setAttribute("user", "root")
                 modification.setAttribute("reporterCorrectionM2", "0")
                 modification.setAttribute("reporterCorrectionM1", "0")
@@ -243,7 +267,7 @@ class Maxquant:
                 w = True
                 name = name.strip()
                 warning_message = "Warning no " + mod + " modification in MaxQuant.Supplement manuanly some parameters"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 modification = mod_local.createElement("modification")
                 if "-" in aa:
                     if pp == "anycterm":
@@ -260,19 +284,9 @@ class Maxquant:
 
                 modification.setAttribute("title", name)
                 modification.setAttribute("description", name + " modification")
-                now_stamp = time.time()
-                local_time = datetime.fromtimestamp(now_stamp)
-                utc_time = datetime.utcfromtimestamp(now_stamp)
-                if local_time > utc_time:
-                    offset = "+" + str(local_time - utc_time).zfill(8)[:5]
-                else:
-                    offset = "-" + str(utc_time - local_time).zfill(8)[:5]
-                modification.setAttribute(
-                    "create_date", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset
-                )
-                modification.setAttribute(
-                    "last_modified_date", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset
-                )
+                timestamp = maxquant_timestamp()
+                modification.setAttribute("create_date", timestamp)
+                modification.setAttribute("last_modified_date", timestamp)
                 modification.setAttribute("user", "root")
                 modification.setAttribute("reporterCorrectionM2", "0")
                 modification.setAttribute("reporterCorrectionM1", "0")
@@ -332,48 +346,36 @@ class Maxquant:
                 if pp_tag == 0:
                     if "->" in name:
                         warning_message = "Warning no " + mod + " modification in MaxQuant.Supplement"
-                        self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                        self.warnings[warning_message] += 1
                         y = True
                         if "nterm" in pp or "cterm" in pp:
                             pp = pp.replace("cterm", "Cterm").replace("nterm", "Nterm")
                         modifications[indexes[0]].getElementsByTagName("position")[0].childNodes[0].data = pp
-                        now_stamp = time.time()
-                        local_time = datetime.fromtimestamp(now_stamp)
-                        utc_time = datetime.utcfromtimestamp(now_stamp)
-                        if local_time > utc_time:
-                            offset = "+" + str(local_time - utc_time).zfill(8)[:5]
-                        else:
-                            offset = "-" + str(utc_time - local_time).zfill(8)[:5]
+                        timestamp = maxquant_timestamp()
                         modifications[indexes[0]].setAttribute(
                             "last_modified_date",
-                            datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset,
+                            timestamp,
                         )
                         modifications[indexes[0]].setAttribute("user", "root")
 
                     elif aa_equal:
                         warning_message = "Warning no " + mod + " modification in MaxQuant.Supplement"
-                        self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                        self.warnings[warning_message] += 1
                         y = True
                         if "nterm" in pp or "cterm" in pp:
                             pp = pp.replace("cterm", "Cterm").replace("nterm", "Nterm")
                         modifications[ta_index].getElementsByTagName("position")[0].childNodes[0].data = pp
-                        now_stamp = time.time()
-                        local_time = datetime.fromtimestamp(now_stamp)
-                        utc_time = datetime.utcfromtimestamp(now_stamp)
-                        if local_time > utc_time:
-                            offset = "+" + str(local_time - utc_time).zfill(8)[:5]
-                        else:
-                            offset = "-" + str(utc_time - local_time).zfill(8)[:5]
+                        timestamp = maxquant_timestamp()
                         modifications[ta_index].setAttribute(
                             "last_modified_date",
-                            datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset,
+                            timestamp,
                         )
                         modifications[ta_index].setAttribute("user", "root")
 
                     else:
                         warning_message = "Warning no " + mod + " modification in MaxQuant.Supplement"
                         w = True
-                        self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                        self.warnings[warning_message] += 1
                         modification = mod_local.createElement("modification")
                         if "-" in aa:
                             pass
@@ -384,19 +386,11 @@ class Maxquant:
                             name = name + ")"
                         modification.setAttribute("title", name)
                         modification.setAttribute("description", name + " modification")
-                        now_stamp = time.time()
-                        local_time = datetime.fromtimestamp(now_stamp)
-                        utc_time = datetime.utcfromtimestamp(now_stamp)
-                        if local_time > utc_time:
-                            offset = "+" + str(local_time - utc_time).zfill(8)[:5]
-                        else:
-                            offset = "-" + str(utc_time - local_time).zfill(8)[:5]
-                        modification.setAttribute(
-                            "create_date", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset
-                        )
+                        timestamp = maxquant_timestamp()
+                        modification.setAttribute("create_date", timestamp)
                         modification.setAttribute(
                             "last_modified_date",
-                            datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset,
+                            timestamp,
                         )
                         modification.setAttribute("user", "root")
                         modification.setAttribute("reporterCorrectionM2", "0")
@@ -432,7 +426,7 @@ class Maxquant:
                 if ta_tag == 0 and pp_tag == 1:
                     w = True
                     warning_message = "Warning no " + mod + " modification in MaxQuant.Supplement"
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                     modification = mod_local.createElement("modification")
                     if "-" in aa or "->" in name:
                         pass
@@ -443,19 +437,9 @@ class Maxquant:
                         name = name + ")"
                     modification.setAttribute("title", name)
                     modification.setAttribute("description", name + " modification")
-                    now_stamp = time.time()
-                    local_time = datetime.fromtimestamp(now_stamp)
-                    utc_time = datetime.utcfromtimestamp(now_stamp)
-                    if local_time > utc_time:
-                        offset = "+" + str(local_time - utc_time).zfill(8)[:5]
-                    else:
-                        offset = "-" + str(utc_time - local_time).zfill(8)[:5]
-                    modification.setAttribute(
-                        "create_date", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset
-                    )
-                    modification.setAttribute(
-                        "last_modified_date", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset
-                    )
+                    timestamp = maxquant_timestamp()
+                    modification.setAttribute("create_date", timestamp)
+                    modification.setAttribute("last_modified_date", timestamp)
                     modification.setAttribute("user", "root")
                     modification.setAttribute("reporterCorrectionM2", "0")
                     modification.setAttribute("reporterCorrectionM1", "0")
@@ -487,7 +471,7 @@ class Maxquant:
             else:
                 w = True
                 warning_message = "Warning no " + mod + " modification in MaxQuant.Supplement"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 modification = mod_local.createElement("modification")
                 if "-" in aa or "->" in name:
                     pass
@@ -498,19 +482,9 @@ class Maxquant:
                     name = name + ")"
                 modification.setAttribute("title", name)
                 modification.setAttribute("description", name + " modification")
-                now_stamp = time.time()
-                local_time = datetime.fromtimestamp(now_stamp)
-                utc_time = datetime.utcfromtimestamp(now_stamp)
-                if local_time > utc_time:
-                    offset = "+" + str(local_time - utc_time).zfill(8)[:5]
-                else:
-                    offset = "-" + str(utc_time - local_time).zfill(8)[:5]
-                modification.setAttribute(
-                    "create_date", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset
-                )
-                modification.setAttribute(
-                    "last_modified_date", datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%f+08.00")[:-7] + offset
-                )
+                timestamp = maxquant_timestamp()
+                modification.setAttribute("create_date", timestamp)
+                modification.setAttribute("last_modified_date", timestamp)
                 modification.setAttribute("user", "root")
                 modification.setAttribute("reporterCorrectionM2", "0")
                 modification.setAttribute("reporterCorrectionM1", "0")
@@ -598,7 +572,7 @@ class Maxquant:
         for m in sdrf_mods:
             if "AC=UNIMOD" not in m and "AC=Unimod" not in m:
                 warning_message = "only UNIMOD modifications supported. skip " + m
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 continue
             name = re.search("NT=(.+?)(;|$)", m).group(1)
 
@@ -636,7 +610,7 @@ class Maxquant:
                     oms_mods.append("Arg6")
                 else:
                     warning_message = "modification is not supported in MaxQuant. skip " + m
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                 continue
 
             if name.lower().startswith("tmt"):
@@ -695,7 +669,7 @@ class Maxquant:
                             oms_mods.append(new_title[index])
                 else:
                     warning_message = "modification is not supported in MaxQuant. skip " + m
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
 
             elif mqconfdir:
                 if name.lower() in new_name and new_position[new_name.index(name.lower())].lower() == pp:
@@ -704,7 +678,7 @@ class Maxquant:
                         oms_mods.append(new_title[index])
             else:
                 warning_message = "modification is not supported in MaxQuant. skip " + m
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
 
         return ",".join(oms_mods)
 
@@ -727,12 +701,7 @@ class Maxquant:
         sdrf = sdrf.astype(str)
         sdrf.columns = map(str.lower, sdrf.columns)  # convert column names to lower-case
 
-        with open(self.datparamfile) as file:
-            param_mapping = yaml.safe_load(file)
-            mapping = param_mapping["parameters"]
-        datparams = {}
-        for i in mapping:
-            datparams[i["sdrf"]] = i["name"]
+        datparams = load_param_mapping(self.datparamfile)
 
         # map filename to tuple of [fixed, variable] mods
         mod_cols = [
@@ -808,12 +777,12 @@ class Maxquant:
                     file2pctolunit[raw] = pc_tmp[1]
                 else:
                     warning_message = "Invalid precursor mass tolerance set. Assuming 4.5 ppm."
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                     file2pctol[raw] = "4.5"
                     file2pctolunit[raw] = "ppm"
             else:
                 warning_message = "No precursor mass tolerance set. Assuming 4.5 ppm."
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 file2pctol[raw] = "4.5"
                 file2pctolunit[raw] = "ppm"
 
@@ -826,12 +795,12 @@ class Maxquant:
                     file2fragtolunit[raw] = f_tmp[1]
                 else:
                     warning_message = "Invalid fragment mass tolerance set. Assuming 20 ppm."
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                     file2fragtol[raw] = "20"
                     file2fragtolunit[raw] = "ppm"
             else:
                 warning_message = "No fragment mass tolerance set. Assuming 20 ppm."
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 file2fragtol[raw] = "20"
                 file2fragtolunit[raw] = "ppm"
 
@@ -844,7 +813,7 @@ class Maxquant:
                     file2diss[raw] = diss_method.upper()
             else:
                 warning_message = "No dissociation method provided. Assuming HCD."
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 file2diss[raw] = "HCD"
 
             if "comment[technical replicate]" in row:
@@ -1046,7 +1015,7 @@ class Maxquant:
 
                 else:
                     warning_message = "Only a silac label! Does it make sense?"
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                     file2label[raw] = label_arr.flatten().tolist()[0]
 
             elif row["comment[label]"].lower().startswith("itraq"):
@@ -1232,10 +1201,10 @@ class Maxquant:
             matchBetweenRuns = True
             matchBetweenRuns_node.appendChild(doc.createTextNode(first))
             warning_message = "overwriting matchBetweenRuns using the value in the sdrf file"
-            self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+            self.warnings[warning_message] += 1
             if len(set(file2params["enable_match_between_runs"].values())) > 1:
                 warning_message = "multiple values for match between runs, taking the first: " + first
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
         else:
             matchBetweenRuns_node.appendChild(doc.createTextNode(matchBetweenRuns))
         root.appendChild(matchBetweenRuns_node)
@@ -1357,10 +1326,10 @@ class Maxquant:
             first = list(tparam.values())[0]
             minPepLen.appendChild(doc.createTextNode(first))
             warning_message = "overwriting minPepLen using the value in the sdrf file"
-            self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+            self.warnings[warning_message] += 1
             if len(set(tparam.values())) > 1:
                 warning_message = "multiple values for parameter minimum peptide length, taking the first: " + first
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
         else:
             minPepLen.appendChild(doc.createTextNode("7"))
         root.appendChild(minPepLen)
@@ -1374,11 +1343,11 @@ class Maxquant:
             tparam = file2params["ident_fdr_peptide"]
             first = list(tparam.values())[0]
             warning_message = "overwriting peptide FDR using the value in the sdrf file"
-            self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+            self.warnings[warning_message] += 1
             peptideFdr.appendChild(doc.createTextNode(first))
             if len(set(tparam.values())) > 1:
                 warning_message = "multiple values for parameter Peptide FDR, taking the first: " + first
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
         else:
             peptideFdr.appendChild(doc.createTextNode(str(peptideFDR)))
         root.appendChild(peptideFdr)
@@ -1388,11 +1357,11 @@ class Maxquant:
             tparam = file2params["ident_fdr_protein"]
             first = list(tparam.values())[0]
             warning_message = "overwriting protein FDR using the value in the sdrf file"
-            self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+            self.warnings[warning_message] += 1
             proteinFdr.appendChild(doc.createTextNode(first))
             if len(set(tparam.values())) > 1:
                 warning_message = "multiple values for parameter Protein FDR, taking the first: " + first
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
         else:
             proteinFdr.appendChild(doc.createTextNode(str(proteinFDR)))
         root.appendChild(proteinFdr)
@@ -1402,11 +1371,11 @@ class Maxquant:
             tparam = file2params["ident_fdr_psm"]
             first = list(tparam.values())[0]
             warning_message = "overwriting PSM FDR using the value in the sdrf file"
-            self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+            self.warnings[warning_message] += 1
             siteFdr.appendChild(doc.createTextNode(first))
             if len(set(tparam.values())) > 1:
                 warning_message = "multiple values for parameter PSM FDR, taking the first: " + first
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
         else:
             siteFdr.appendChild(doc.createTextNode("0.01"))
         root.appendChild(siteFdr)
@@ -1429,10 +1398,10 @@ class Maxquant:
             first = list(tparam.values())[0]
             minPeptides.appendChild(doc.createTextNode(first))
             warning_message = "overwriting minPeptides using the value in the sdrf file"
-            self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+            self.warnings[warning_message] += 1
             if len(set(tparam.values())) > 1:
                 warning_message = "multiple values for parameter minimum number of peptides, taking the first: " + first
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
         else:
             minPeptides.appendChild(doc.createTextNode("1"))
         root.appendChild(minPeptides)
@@ -1517,10 +1486,10 @@ class Maxquant:
                 first = "1"
             quantMode.appendChild(doc.createTextNode(first))
             warning_message = "overwriting quantMode using the value in the sdrf file"
-            self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+            self.warnings[warning_message] += 1
             if len(set(tparam.values())) > 1:
                 warning_message = "multiple values for parameter Quantification mode, taking the first: " + first
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
         else:
             quantMode.appendChild(doc.createTextNode("1"))
         root.appendChild(quantMode)
@@ -1,4 +1,5 @@
 import re
+from collections import Counter
 
 import pandas as pd
 
@@ -8,7 +9,7 @@ import pandas as pd
 class Msstats:
     def __init__(self) -> None:
         """Convert sdrf to msstats annotation file (label free sample)."""
-        self.warnings = {}
+        self.warnings = Counter()
 
     # Consider unlabeled analysis for now
     def convert_msstats_annotation(
@@ -66,7 +67,7 @@ class Msstats:
                     BioReplicate.append(sample)
             else:
                 warning_message = "No sample number identifier"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
 
                 # Solve non-sample id expression models
                 if source_name in sample_id_map.keys():
@@ -101,6 +102,6 @@ class Msstats:
         combined_factors = "_".join(all_factors)
         if combined_factors == "":
             warning_message = "No factors specified. Adding Source Name as factor. Will be used as condition. "
-            self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+            self.warnings[warning_message] += 1
             combined_factors = row["source name"]
         return combined_factors
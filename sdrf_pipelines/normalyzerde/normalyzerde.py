@@ -3,6 +3,7 @@
 
 import csv
 import re
+from collections import Counter
 
 import pandas as pd
 
@@ -14,7 +15,7 @@ import pandas as pd
 class NormalyzerDE:
     def __init__(self) -> None:
         """Convert sdrf to normalyzerde design file (label free quantification assumed)."""
-        self.warnings = {}
+        self.warnings = Counter()
 
     # Consider unlabeled analysis for now
     def convert_normalyzerde_design(
@@ -124,7 +125,7 @@ class NormalyzerDE:
                     BioReplicate.append(sample)
             else:
                 warning_message = "No sample number identifier"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
 
                 # Solve non-sample id expression models
                 if source_name in sample_id_map.keys():
@@ -150,6 +151,6 @@ class NormalyzerDE:
         combined_factors = "_".join(all_factors)
         if combined_factors == "":
             warning_message = "No factors specified. Adding Source Name as factor. Will be used " "as condition. "
-            self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+            self.warnings[warning_message] += 1
             combined_factors = row["source name"]
         return combined_factors
@@ -11,15 +11,18 @@ TODO: check input parameters are valid
 TODO: handle requests.exceptions.ConnectionError when traffic is too high and API goes down
 """
 
+import functools
 import glob
 import logging
 import os.path
+import threading
 import urllib.parse
 
+import defusedxml
+import defusedxml.ElementTree as et
 import duckdb
 import pandas as pd
 import pkg_resources
-import rdflib
 import requests
 
 OLS = "https://www.ebi.ac.uk/ols4"
@@ -35,6 +38,18 @@ API_TERM = "/api/ontologies/{ontology}/terms/{iri}"
 API_ANCESTORS = "/api/ontologies/{ontology}/terms/{iri}/ancestors"
 API_PROPERTIES = "/api/ontologies/{ontology}/properties?lang=en"
 
+RDF_NS = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+RDF_ABOUT = RDF_NS + "about"
+RDF_ID = RDF_NS + "ID"
+RDF_PARSE_TYPE = RDF_NS + "parseType"
+RDF_DATATYPE = RDF_NS + "datatype"
+RDF_RESOURCE = RDF_NS + "resource"
+RDF_TYPE = RDF_NS + "type"
+RDFS_LABEL = "{http://www.w3.org/2000/01/rdf-schema#}label"
+OWL_CLASS_IRI = "http://www.w3.org/2002/07/owl#Class"
+OWL_CLASS = "{http://www.w3.org/2002/07/owl#}Class"
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
 
 def _concat_str_or_list(input_str):
     """
@@ -67,10 +82,22 @@ class OlsTerm:
         return f"{self._term} -- {self._ontology} -- {self._iri}"
 
 
+# Clients can be created from several threads, the cache files are listed under this lock so the default duckdb
+# connection is never queried concurrently
+_cache_parquet_files_lock = threading.Lock()
+
+
 def get_cache_parquet_files():
     """
-    This function returns a list of parquet files in the cache directory.
+    This function returns a list of parquet files in the cache directory. The cache files ship with the package and
+    do not change while running, so they are only listed and queried once per process.
     """
+    with _cache_parquet_files_lock:
+        return _list_cache_parquet_files()
+
+
+@functools.lru_cache(maxsize=None)
+def _list_cache_parquet_files():
     parquet_files_pattern = pkg_resources.resource_filename(__name__, "*.parquet")
     parquet_files = glob.glob(parquet_files_pattern)
 
@@ -89,6 +116,7 @@ def get_cache_parquet_files():
     return parquet_files, ontologies
 
 
+@functools.lru_cache(maxsize=4096)
 def get_obo_accession(uri):
     # Example: Convert 'http://www.ebi.ac.uk/efo/EFO_0000001' to 'EFO:0000001'
     try:
@@ -105,20 +133,83 @@ def get_obo_accession(uri):
     return None
 
 
+def _label_key(name, lang, datatype):
+    """
+    Identify a label literal as an RDF graph does, typed literals have no language and language tags are not case
+    sensitive
+    """
+    if datatype is not None:
+        return name, None, datatype
+    return name, lang.lower() if lang else None, None
+
+
+def _read_owl_class_labels(ontology_file):
+    """
+    Stream an RDF/XML OWL file and collect the labels of its named classes, without building the whole RDF graph.
+    Classes can be declared as owl:Class elements or as resources typed owl:Class, and their labels can be given in
+    any element describing the same IRI. As in an RDF graph, a label stated several times for a class is only kept
+    once, labels are told apart by their text, language and datatype.
+    @:param ontology_file: The name of the ontology file
+    @:return: dictionary {class IRI -> labels}, classes in document order
+    """
+    classes = {}
+    labels = {}
+    # xml:lang is inherited from the enclosing elements, the language in scope is stacked for every open element
+    langs = [None]
+    root = None
+    for event, element in et.iterparse(ontology_file, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            langs.append(element.get(XML_LANG, langs[-1]))
+            continue
+        lang = langs.pop()
+        if RDF_ID in element.attrib:
+            # IRIs relative to the document base are resolved by rdflib only
+            raise ValueError(f"Unsupported rdf:ID in {ontology_file}")
+        about = element.get(RDF_ABOUT)
+        if about is not None:
+            if ":" not in about:
+                raise ValueError(f"Unsupported relative IRI {about} in {ontology_file}")
+            if element.tag == OWL_CLASS or any(
+                child.tag == RDF_TYPE and child.get(RDF_RESOURCE) == OWL_CLASS_IRI for child in element
+            ):
+                classes.setdefault(about, None)
+            names = {}
+            for child in element:
+                if child.tag == RDFS_LABEL:
+                    if RDF_PARSE_TYPE in child.attrib:
+                        # XML literal labels are serialised from their markup by rdflib only
+                        raise ValueError(f"Unsupported rdf:parseType label of {about} in {ontology_file}")
+                    name = child.text or ""
+                    names[_label_key(name, child.get(XML_LANG, lang), child.get(RDF_DATATYPE))] = name
+            if RDFS_LABEL in element.attrib:
+                name = element.get(RDFS_LABEL)
+                names[_label_key(name, lang, None)] = name
+            if names:
+                labels.setdefault(about, {}).update(names)
+        if len(langs) == 2:
+            # Every top level resource is done with, release it so memory does not grow with the file
+            root.clear()
+    return {iri: list(labels[iri].values()) for iri in classes if iri in labels}
+
+
 def read_owl_file(ontology_file, ontology_name=None):
     """
     Reads an OWL file and returns a list of OlsTerms
     @:param ontology_file: The name of the ontology
     @:param ontology_name: The name of the ontology
     """
-    g = rdflib.Graph()
-    g.parse(ontology_file, format="xml")
-    terms_info = []
+    try:
+        class_labels = _read_owl_class_labels(ontology_file)
+    except (et.ParseError, defusedxml.DefusedXmlException, ValueError) as ex:
+        # Entity declarations are not expanded by the streaming reader, rdflib reads those files
+        logger.info("Reading %s with rdflib: %s", ontology_file, ex)
+        class_labels = _read_owl_class_labels_rdflib(ontology_file)
 
-    for s, _, _ in g.triples((None, rdflib.RDF.type, rdflib.OWL.Class)):
-        term_id = str(s)
-        for _, _, name in g.triples((s, rdflib.RDFS.label, None)):
-            term_name = str(name)
+    terms_info = []
+    for term_id, names in class_labels.items():
+        for term_name in names:
             terms_info.append({"accession": get_obo_accession(term_id), "label": term_name, "ontology": ontology_name})
 
     # remove terms with no label or accession
@@ -126,6 +217,26 @@ def read_owl_file(ontology_file, ontology_name=None):
     return terms_info
 
 
+def _read_owl_class_labels_rdflib(ontology_file):
+    """
+    Read the labels of the classes of an RDF/XML OWL file with rdflib, which handles the constructs the streaming
+    reader does not, such as relative IRIs and XML literal labels
+    @:param ontology_file: The name of the ontology file
+    @:return: dictionary {class IRI -> labels}
+    """
+    # rdflib takes a while to import and is only needed for the OWL files the streaming reader does not support
+    import rdflib
+
+    g = rdflib.Graph()
+    g.parse(ontology_file, format="xml")
+    class_labels = {}
+    for s, _, _ in g.triples((None, rdflib.RDF.type, rdflib.OWL.Class)):
+        names = [str(name) for _, _, name in g.triples((s, rdflib.RDFS.label, None))]
+        if names:
+            class_labels[str(s)] = names
+    return class_labels
+
+
 def read_obo_file(ontology_file, ontology_name=None):
     """
     Reads an OBO file and returns a list of OlsTerms
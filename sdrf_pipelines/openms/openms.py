@@ -5,6 +5,13 @@ import pandas as pd
 
 from sdrf_pipelines.openms.unimod import UnimodDatabase
 
+SAMPLE_IDENTIFIER_RE = re.compile(r"sample (\d+)$", re.IGNORECASE)
+# Keys of the key=value pairs used in the SDRF cells, e.g. NT=Oxidation;AC=UNIMOD:35;PP=Anywhere;TA=M
+TERM_NAME_RE = re.compile("NT=(.+?)(;|$)")
+ACCESSION_RE = re.compile("AC=(.+?)(;|$)")
+POSITION_RE = re.compile("PP=(.+?)(;|$)")
+TARGET_AMINO_ACID_RE = re.compile("TA=(.+?)(;|$)")
+
 # example: parse_sdrf convert-openms -s .\sdrf-pipelines\sdrf_pipelines\large_sdrf.tsv -c '[characteristics[biological replicate],characteristics[individual]]'
 
 
@@ -76,7 +83,7 @@ def get_openms_file_name(raw, extension_convert: str = None):
 class OpenMS:
     def __init__(self) -> None:
         super().__init__()
-        self.warnings = {}
+        self.warnings = Counter()
         self._unimod_database = UnimodDatabase()
         self.tmt16plex = {
             "TMT126": 1,
@@ -170,26 +177,26 @@ class OpenMS:
             if "AC=UNIMOD" not in m and "AC=Unimod" not in m:
                 raise Exception("only UNIMOD modifications supported. " + m)
 
-            name = re.search("NT=(.+?)(;|$)", m).group(1)
+            name = TERM_NAME_RE.search(m).group(1)
             name = name.capitalize()
 
-            accession = re.search("AC=(.+?)(;|$)", m).group(1)
+            accession = ACCESSION_RE.search(m).group(1)
             ptm = self._unimod_database.get_by_accession(accession)
             if ptm is not None:
                 name = ptm.get_name()
 
             # workaround for missing PP in some sdrf TODO: fix in sdrf spec?
-            if re.search("PP=(.+?)(;|$)", m) is None:
+            pp_match = POSITION_RE.search(m)
+            if pp_match is None:
                 pp = "Anywhere"
             else:
-                pp = re.search("PP=(.+?)(;|$)", m).group(
-                    1
-                )  # one of [Anywhere, Protein N-term, Protein C-term, Any N-term, Any C-term
+                pp = pp_match.group(1)  # one of [Anywhere, Protein N-term, Protein C-term, Any N-term, Any C-term
 
             ta = ""
-            if re.search("TA=(.+?)(;|$)", m) is None:  # TODO: missing in sdrf.
+            ta_match = TARGET_AMINO_ACID_RE.search(m)
+            if ta_match is None:  # TODO: missing in sdrf.
                 warning_message = "Warning no TA= specified. Setting to N-term or C-term if possible."
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 if "C-term" in pp:
                     ta = "C-term"
                 elif "N-term" in pp:
@@ -197,9 +204,9 @@ class OpenMS:
                 else:
                     warning_message = "Reassignment not possible. Skipping."
                     # print(warning_message + " "+ m)
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
             else:
-                ta = re.search("TA=(.+?)(;|$)", m).group(1)  # target amino-acid
+                ta = ta_match.group(1)  # target amino-acid
             aa = ta.split(",")  # multiply target site e.g., S,T,Y including potentially termini "C-term"
 
             if pp == "Protein N-term" or pp == "Protein C-term":
@@ -247,7 +254,7 @@ class OpenMS:
             raise Exception(
                 "Encountered empty cells while reading SDRF."
                 "Please check your file, e.g. for too many column headers or empty fields"
-                "Columns with empty values: {}".format(list(null_cols))
+                f"Columns with empty values: {list(null_cols)}"
             )
         sdrf = sdrf.astype(str)
         sdrf.columns = map(str.lower, sdrf.columns)  # convert column names to lower-case
@@ -312,12 +319,12 @@ class OpenMS:
                     f2c.file2pctolunit[raw] = pc_tmp[1]
                 else:
                     warning_message = "Invalid precursor mass tolerance set. Assuming 10 ppm."
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                     f2c.file2pctol[raw] = "10"
                     f2c.file2pctolunit[raw] = "ppm"
             else:
                 warning_message = "No precursor mass tolerance set. Assuming 10 ppm."
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 f2c.file2pctol[raw] = "10"
                 f2c.file2pctolunit[raw] = "ppm"
 
@@ -330,26 +337,27 @@ class OpenMS:
                     f2c.file2fragtolunit[raw] = f_tmp[1]
                 else:
                     warning_message = "Invalid fragment mass tolerance set. Assuming 20 ppm."
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                     f2c.file2fragtol[raw] = "20"
                     f2c.file2fragtolunit[raw] = "ppm"
             else:
                 warning_message = "No fragment mass tolerance set. Assuming 20 ppm."
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 f2c.file2fragtol[raw] = "20"
                 f2c.file2fragtolunit[raw] = "ppm"
 
             if "comment[dissociation method]" in row:
-                if re.search("NT=(.+?)(;|$)", row["comment[dissociation method]"]) is not None:
-                    diss_method = re.search("NT=(.+?)(;|$)", row["comment[dissociation method]"]).group(1)
+                diss_match = TERM_NAME_RE.search(row["comment[dissociation method]"])
+                if diss_match is not None:
+                    diss_method = diss_match.group(1)
                     f2c.file2diss[raw] = diss_method.upper()
                 else:
                     warning_message = "No dissociation method provided. Assuming HCD."
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                     f2c.file2diss[raw] = "HCD"
             else:
                 warning_message = "No dissociation method provided. Assuming HCD."
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 f2c.file2diss[raw] = "HCD"
 
             if "comment[technical replicate]" in row:
@@ -369,7 +377,7 @@ class OpenMS:
             else:
                 source_name2n_reps[source_name] = int(f2c.file2technical_rep[raw])
 
-            enzyme = re.search("NT=(.+?)(;|$)", row["comment[cleavage agent details]"]).group(1)
+            enzyme = TERM_NAME_RE.search(row["comment[cleavage agent details]"]).group(1)
 
             enzyme = enzyme.capitalize()
             # This is to check if the openMS map of enzymes
@@ -387,8 +395,9 @@ class OpenMS:
             else:
                 f2c.file2fraction[raw] = "1"
 
-            if re.search("NT=(.+?)(;|$)", row["comment[label]"]) is not None:
-                label = re.search("NT=(.+?)(;|$)", row["comment[label]"]).group(1)
+            label_match = TERM_NAME_RE.search(row["comment[label]"])
+            if label_match is not None:
+                label = label_match.group(1)
                 f2c.file2label[raw] = [label]
             else:
                 if "TMT" in row["comment[label]"]:
@@ -419,8 +428,9 @@ class OpenMS:
 
             # print("Combined factors: " + str(combined_factors))
 
-        conditions = Counter(f2c.file2combined_factors.values()).keys()
-        files_per_condition = Counter(f2c.file2combined_factors.values()).values()
+        files_per_factors = Counter(f2c.file2combined_factors.values())
+        conditions = files_per_factors.keys()
+        files_per_condition = files_per_factors.values()
         print("Conditions (" + str(len(conditions)) + "): " + str(conditions))
         print("Files per condition: " + str(files_per_condition))
 
@@ -501,14 +511,14 @@ class OpenMS:
             combined_factors = "|".join(all_factors)
             if combined_factors == "":
                 warning_message = "No factors specified. Adding dummy factor used as condition."
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 combined_factors = None
             else:
                 warning_message = (
                     "No factors specified. Adding non-redundant characteristics as factor. Will be used "
                     "as condition. "
                 )
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
         return combined_factors
 
     def removeRedundantCharacteristics(self, characteristics_cols, sdrf, factor_cols):
@@ -544,7 +554,6 @@ class OpenMS:
         f = ""
         f += "\t".join(openms_file_header) + "\n"
         label_index = dict(zip(sdrf["comment[data file]"], [0] * len(sdrf["comment[data file]"])))
-        sample_identifier_re = re.compile(r"sample (\d+)$", re.IGNORECASE)
         Fraction_group = {}
         sample_id_map = {}
         sample_id = 1
@@ -581,11 +590,12 @@ class OpenMS:
                 raw_frac[fraction_group].append(raw)
                 Fraction_group[raw] = Fraction_group[raw_frac[fraction_group][0]]
 
-            if re.search(sample_identifier_re, source_name) is not None:
-                sample = re.search(sample_identifier_re, source_name).group(1)
+            sample_match = SAMPLE_IDENTIFIER_RE.search(source_name)
+            if sample_match is not None:
+                sample = sample_match.group(1)
             else:
                 warning_message = "No sample identifier"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
 
                 # Solve non-sample id expression models
                 if source_name in sample_id_map.keys():
@@ -667,8 +677,9 @@ class OpenMS:
         for _0, row in sdrf.iterrows():
             raw = row["comment[data file]"]
             source_name = row["source name"]
-            if re.search(sample_identifier_re, source_name) is not None:
-                sample = re.search(sample_identifier_re, source_name).group(1)
+            sample_match = SAMPLE_IDENTIFIER_RE.search(source_name)
+            if sample_match is not None:
+                sample = sample_match.group(1)
 
                 # MSstats BioReplicate column needs to be different for samples from different conditions.
                 # so we can't just use the technical replicate identifier in sdrf but use the sample identifer
@@ -677,7 +688,7 @@ class OpenMS:
                     BioReplicate.append(sample)
             else:
                 warning_message = "No sample identifier"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
 
                 # Solve non-sample id expression models
                 sample = sample_id_map[source_name]
@@ -776,7 +787,6 @@ class OpenMS:
 
         f += "\t".join(open_ms_experimental_design_header) + "\n"
         label_index = dict(zip(sdrf["comment[data file]"], [0] * len(sdrf["comment[data file]"])))
-        sample_identifier_re = re.compile(r"sample (\d+)$", re.IGNORECASE)
         Fraction_group = {}
         mixture_identifier = 1
         mixture_raw_tag = {}
@@ -817,8 +827,9 @@ class OpenMS:
                 raw_frac[fraction_group].append(raw)
                 Fraction_group[raw] = Fraction_group[raw_frac[fraction_group][0]]
 
-            if re.search(sample_identifier_re, source_name) is not None:
-                sample = re.search(sample_identifier_re, source_name).group(1)
+            sample_match = SAMPLE_IDENTIFIER_RE.search(source_name)
+            if sample_match is not None:
+                sample = sample_match.group(1)
 
                 # MSstats BioReplicate column needs to be different for samples from different conditions.
                 # so we can't just use the technical replicate identifier in sdrf but use the sample identifer
@@ -827,7 +838,7 @@ class OpenMS:
                     BioReplicate.append(sample)
             else:
                 warning_message = "No sample number identifier"
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
 
                 # Solve non-sample id expression models
                 if source_name in sample_id_map.keys():
@@ -1014,7 +1025,7 @@ class OpenMS:
                     "The comment[proteomics data acquisition method] column is missing, "
                     "default Data-Dependent Acquisition"
                 )
-                self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                self.warnings[warning_message] += 1
                 acquisition_method = "Data-Dependent Acquisition"
             else:
                 acquisition_method = row["comment[proteomics data acquisition method]"]
@@ -1047,7 +1058,7 @@ class OpenMS:
                         "The sdrf with TMT label doesn't contain TMT modification. Adding default "
                         "variable modifications."
                     )
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                     tmt_var_mod = TMT_mod[label]
                     if f2c.file2mods[raw][1]:
                         VarMod = ",".join(f2c.file2mods[raw][1].split(",") + tmt_var_mod)
@@ -1075,7 +1086,7 @@ class OpenMS:
                         "The sdrf with ITRAQ label doesn't contain label modification. Adding default "
                         "variable modifications."
                     )
-                    self.warnings[warning_message] = self.warnings.get(warning_message, 0) + 1
+                    self.warnings[warning_message] += 1
                     itraq_var_mod = ITRAQ_mod[label]
                     if f2c.file2mods[raw][1]:
                         VarMod = ",".join(f2c.file2mods[raw][1].split(",") + itraq_var_mod)
@@ -5,6 +5,8 @@ import pkg_resources
 
 
 class PTMSite:
+    __slots__ = ("_site", "_position")
+
     def __init__(self, site: str, position: str) -> None:
         self._site = site
         self._position = position
@@ -17,6 +19,8 @@ class PTMSite:
 
 
 class OntologyTerm:
+    __slots__ = ("_accession", "_name")
+
     def __init__(self, accession: str, name: str) -> None:
         self._accession = accession
         self._name = name
@@ -29,6 +33,8 @@ class OntologyTerm:
 
 
 class PostTranslationalModification:
+    __slots__ = ("_ontology_term", "_delta_composition", "_site", "_delta_mono_mass")
+
     def __init__(self, ontology_term: OntologyTerm, delta_composition: str, sites, delta_mono_mass) -> None:
         self._ontology_term = ontology_term
         self._delta_composition = delta_composition
@@ -67,13 +73,15 @@ class UnimodDatabase:
         self.residues = {}
         self.labels = {}
         self.modifications = []
+        self._modifications_by_accession = {}
         self._get_elements(node)
         self._get_modifications(node)
 
     def search_mods_by_keyword(self, keyword: str = None):
         found_list = self.modifications
         if keyword is not None and len(keyword) > 0:
-            found_list = [x for x in self.modifications if re.search(keyword, x.to_str(), re.IGNORECASE)]
+            pattern = re.compile(keyword, re.IGNORECASE)
+            found_list = [x for x in self.modifications if pattern.search(x.to_str())]
         return found_list
 
     def _get_elements(self, node):
@@ -100,19 +108,8 @@ class UnimodDatabase:
                         ma["sites"][r.attrib["site"]]["NeutralLoss"].append(n.attrib)
                     # add to aa mods list.
 
-                    if r.attrib["site"] in self.residues:
-                        self.residues[r.attrib["site"]].append(ma["title"])
-                    else:
-                        self.residues[r.attrib["site"]] = [
-                            ma["title"],
-                        ]
-
-                    if r.attrib["spec_group"] in ma["spec_group"]:
-                        ma["spec_group"][r.attrib["spec_group"]].append(r.attrib["site"])
-                    else:
-                        ma["spec_group"][r.attrib["spec_group"]] = [
-                            r.attrib["site"],
-                        ]
+                    self.residues.setdefault(r.attrib["site"], []).append(ma["title"])
+                    ma["spec_group"].setdefault(r.attrib["spec_group"], []).append(r.attrib["site"])
 
             ontology_accession = "UNIMOD:" + ma["record_id"]
             ontology_term = OntologyTerm(ontology_accession, ma["title"])
@@ -122,9 +119,7 @@ class UnimodDatabase:
                 sites.append(site)
             mod = PostTranslationalModification(ontology_term, ma["delta_composition"], sites, ma["delta_mono_mass"])
             self.modifications.append(mod)
+            self._modifications_by_accession.setdefault(ontology_accession, mod)
 
     def get_by_accession(self, accession):
-        for mod in self.modifications:
-            if mod.get_accession() == accession:
-                return mod
-        return None
+        return self._modifications_by_accession.get(accession)
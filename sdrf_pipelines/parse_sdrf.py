@@ -22,6 +22,8 @@ from sdrf_pipelines.sdrf.sdrf_schema import MASS_SPECTROMETRY
 from sdrf_pipelines.utils.exceptions import AppConfigException
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
+# Suffix pandas appends to duplicated column names, e.g. "comment[modification parameters].1"
+DUPLICATE_COLUMN_SUFFIX_RE = re.compile(r"\]\.\d+\t")
 
 
 @click.version_option(version=__version__, package_name="sdrf_pipelines", message="%(package)s %(version)s")
@@ -192,8 +194,13 @@ def validate_sdrf(
     if not skip_experimental_design_validation:
         errors = errors + df.validate_experimental_design()
 
+    # The template and the mass spectrometry schemas share some checks, report every distinct error only once
+    reported = set()
     for error in errors:
-        print(error)
+        message = str(error)
+        if message not in reported:
+            reported.add(message)
+            print(message)
 
     # provide some info to the user, as no info is confusing
     if not errors:
@@ -209,7 +216,6 @@ def validate_sdrf(
 @click.option("--prefix", "-p", help="file prefix to be added to the sdrf file name")
 @click.pass_context
 def split_sdrf(ctx, sdrf_file: str, attribute: str, prefix: str):
-    pattern = re.compile(r"\]\.\d+\t")
     df = pd.read_csv(sdrf_file, sep="\t", skip_blank_lines=False)
     attributes = attribute.split(",")
     d = dict(tuple(df.groupby(attributes)))
@@ -226,14 +232,10 @@ def split_sdrf(ctx, sdrf_file: str, attribute: str, prefix: str):
             new_file = prefix + "-" + "-".join(key).replace(" ", "_") + ".sdrf.tsv"
         else:
             new_file = prefix + "-" + key.replace(" ", "_") + ".sdrf.tsv"
-        dataframe.to_csv(Path + new_file, sep="\t", quoting=csv.QUOTE_NONE, index=False)
-
-        # Handling duplicate column names
-        with open(Path + new_file, "r+") as f:
-            data = f.read()
-        data = pattern.sub("]\t", data)
-        with open(Path + new_file, "w") as f:
-            f.write(data)
+        with open(Path + new_file, "w", newline="") as f:
+            # Handling duplicate column names, only the header needs it so the rows are streamed to the file as they are
+            f.write(DUPLICATE_COLUMN_SUFFIX_RE.sub("]\t", "\t".join(dataframe.columns) + os.linesep))
+            dataframe.to_csv(f, sep="\t", quoting=csv.QUOTE_NONE, index=False, header=False)
 
 
 @click.command("convert-msstats", short_help="convert sdrf to msstats annotation file")
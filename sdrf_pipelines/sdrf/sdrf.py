@@ -20,6 +20,15 @@ from sdrf_pipelines.sdrf.sdrf_schema import plants_chema
 from sdrf_pipelines.sdrf.sdrf_schema import vertebrates_chema
 from sdrf_pipelines.utils.exceptions import LogicError
 
+# Schemas validated on top of the default schema for every template
+TEMPLATE_SCHEMAS = {
+    HUMAN_TEMPLATE: human_schema,
+    VERTEBRATES_TEMPLATE: vertebrates_chema,
+    NON_VERTEBRATES_TEMPLATE: nonvertebrates_chema,
+    PLANTS_TEMPLATE: plants_chema,
+    CELL_LINES_TEMPLATE: cell_lines_schema,
+}
+
 
 def check_if_integer(x):
     """
@@ -74,22 +83,13 @@ class SdrfDataFrame(pd.DataFrame):
         Validate a corresponding SDRF
         :return:
         """
-        errors = []
-        if template != MASS_SPECTROMETRY:
-            errors = default_schema.validate(self, use_ols_cache_only=use_ols_cache_only)
-
-        if template == HUMAN_TEMPLATE:
-            errors = errors + human_schema.validate(self, use_ols_cache_only=use_ols_cache_only)
-        elif template == VERTEBRATES_TEMPLATE:
-            errors = errors + vertebrates_chema.validate(self, use_ols_cache_only=use_ols_cache_only)
-        elif template == NON_VERTEBRATES_TEMPLATE:
-            errors = errors + nonvertebrates_chema.validate(self, use_ols_cache_only=use_ols_cache_only)
-        elif template == PLANTS_TEMPLATE:
-            errors = errors + plants_chema.validate(self, use_ols_cache_only=use_ols_cache_only)
-        elif template == CELL_LINES_TEMPLATE:
-            errors = errors + cell_lines_schema.validate(self, use_ols_cache_only=use_ols_cache_only)
-        elif template == MASS_SPECTROMETRY:
-            errors = mass_spectrometry_schema.validate(self, use_ols_cache_only=use_ols_cache_only)
+        if template == MASS_SPECTROMETRY:
+            return mass_spectrometry_schema.validate(self, use_ols_cache_only=use_ols_cache_only)
+
+        errors = default_schema.validate(self, use_ols_cache_only=use_ols_cache_only)
+        schema = TEMPLATE_SCHEMAS.get(template)
+        if schema is not None:
+            errors = errors + schema.validate(self, use_ols_cache_only=use_ols_cache_only)
 
         return errors
 
@@ -195,15 +195,17 @@ class SdrfDataFrame(pd.DataFrame):
             "comment[fraction identifier]",
         ]
 
+        sdrf_columns = frozenset(self.columns)
         for col in cols:
-            if col not in self.columns:
+            if col not in sdrf_columns:
                 error_message = (
                     f"In order to perform experimental design validation, column '{col}' must be present in the SDRF"
                 )
                 errors.append(LogicError(error_message, error_type=logging.ERROR))
 
-        colum_present = all(col in self.columns for col in cols)
-        if not colum_present:
+        colum_present = sdrf_columns.issuperset(cols)
+        # A single row can not be duplicated, skip hashing the combinations
+        if not colum_present or len(self) < 2:
             return errors
 
         duplicates = self.duplicated(subset=cols, keep=False)
@@ -1,23 +1,27 @@
+import functools
 import logging
 import re
-import sys
+import threading
 import typing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from typing import Any
 
+import numpy as np
 import pandas as pd
 from pandas_schema import Column
 from pandas_schema import Schema
-from pandas_schema.validation import LeadingWhitespaceValidation
 from pandas_schema.validation import MatchesPatternValidation
-from pandas_schema.validation import TrailingWhitespaceValidation
 from pandas_schema.validation import _BaseValidation
 from pandas_schema.validation import _SeriesValidation
 
 from sdrf_pipelines.ols.ols import OlsClient
-from sdrf_pipelines.sdrf import sdrf
 from sdrf_pipelines.utils.exceptions import LogicError
 
-client = OlsClient()
+if typing.TYPE_CHECKING:
+    # sdrf imports the schemas defined here, only import it for type checking to avoid a circular import
+    from sdrf_pipelines.sdrf import sdrf
 
 HUMAN_TEMPLATE = "human"
 DEFAULT_TEMPLATE = "default"
@@ -38,15 +42,47 @@ ALL_TEMPLATES = [
 TERM_NAME = "NT"
 NOT_AVAILABLE = "not available"
 NOT_APPLICABLE = "not applicable"
+OLS_MAX_WORKERS = 8
+# Number of term searches kept by the ontology validations, the least recently used ones are dropped first
+OLS_SEARCH_CACHE_SIZE = 100_000
+EMPTY_CELLS_MAX_WORKERS = 8
+# Number of cells from which the empty cell check is spread over several threads
+EMPTY_CELLS_PARALLEL_THRESHOLD = 100_000
+AGE_PATTERN = re.compile(r"(?:^(?:\d+y)?(?:\d+m)?(?:\d+d)?$)|(?:not available)|(?:not applicable)")
 
 
 def check_minimum_columns(panda_sdrf=None, minimun_columns: int = 0):
     return len(panda_sdrf.get_sdrf_columns()) < minimun_columns
 
 
+def as_str(series: pd.Series) -> pd.Series:
+    """
+    Convert the values of a column to strings. Columns that only hold strings, which is the case for a parsed SDRF,
+    are returned as they are instead of being copied.
+    :param series: column of the SDRF
+    :return: column of strings
+    """
+    if pd.api.types.infer_dtype(series, skipna=False) == "string":
+        return series
+    return series.astype(str)
+
+
+def empty_cells_mask(series: pd.Series) -> np.ndarray:
+    """
+    Flag the empty cells of a column: missing values, "nan" strings and values made only of whitespace
+    :param series: column of the SDRF
+    :return: boolean array, True for the empty cells
+    """
+    # Arrow backed strings keep the missing values as NA, the whole check runs on the column without per cell checks
+    values = series.astype("string[pyarrow]")
+    return (values.eq("nan") | values.str.strip().eq("")).to_numpy(dtype=bool, na_value=True)
+
+
+@functools.lru_cache(maxsize=8192)
 def ontology_term_parser(cell_value: str = None):
     """
-    Parse a line string and convert it into a dictionary {key -> value}
+    Parse a line string and convert it into a dictionary {key -> value}. Results are cached, the returned
+    dictionary is shared between calls and must not be modified.
     :param cell_value: String line
     :return:
     """
@@ -100,11 +136,73 @@ class SDRFColumn(Column):
                 validation.set_ols_strategy(use_ols_cache_only=use_ols_cache_only)
 
 
+class SDRFPatternValidation(MatchesPatternValidation):
+    """
+    Validates that a regular expression can match somewhere in each element in this column. The pattern is searched
+    once for every distinct value of the column and the result is mapped back to the cells.
+    """
+
+    def validate(self, series: pd.Series) -> pd.Series:
+        if self.options:
+            # Options are arguments of Series.str.contains, let pandas_schema apply them
+            return super().validate(series)
+        pattern = re.compile(self.pattern)
+        # The values are converted to strings first, as pandas_schema does, so missing values are matched as their
+        # text ("None", "nan") and there is no missing value left to factorize
+        codes, uniques = pd.factorize(series.astype(str))
+        valid = np.array([pattern.search(value) is not None for value in uniques], dtype=bool)
+        return pd.Series(valid[codes], index=series.index)
+
+
+class LeadingWhitespaceValidation(_SeriesValidation):
+    """
+    Checks that there is no leading whitespace in this column. Only the first character of every distinct value is
+    inspected instead of matching a regular expression against every cell.
+    """
+
+    @property
+    def default_message(self):
+        return "contains leading whitespace"
+
+    def validate(self, series: pd.Series) -> pd.Series:
+        codes, uniques = pd.factorize(series)
+        valid = ~as_str(pd.Series(uniques, dtype=object)).str[:1].str.isspace().to_numpy(dtype=bool)
+        # Missing values are coded as -1, which picks the trailing True
+        return pd.Series(np.append(valid, True)[codes], index=series.index)
+
+
+class TrailingWhitespaceValidation(_SeriesValidation):
+    """
+    Checks that there is no trailing whitespace in this column. Only the last character of every cell is inspected,
+    which avoids running a regular expression over the whole value. SDRF columns repeat the same values many times,
+    so every distinct value is checked once and the result is mapped back to the cells.
+    """
+
+    @property
+    def default_message(self):
+        return "contains trailing whitespace"
+
+    def validate(self, series: pd.Series) -> pd.Series:
+        codes, uniques = pd.factorize(series)
+        valid = ~as_str(pd.Series(uniques, dtype=object)).str[-1:].str.isspace().to_numpy(dtype=bool)
+        # Missing values are coded as -1, which picks the trailing True
+        return pd.Series(np.append(valid, True)[codes], index=series.index)
+
+
 class OntologyTerm(_SeriesValidation):
     """
     Checks that there is no leading whitespace in this column
     """
 
+    # Shared by all the validations, created on first use so importing the schemas does not query the OLS cache
+    _client = None
+    _client_lock = threading.Lock()
+    # Labels found for each (term name, ontology, cache only) search. The same columns are validated by several
+    # schemas, e.g. the default and the human template, so the searches are shared by all the validations. The
+    # searches run in several threads, the cache is only used under its lock.
+    _search_cache: "OrderedDict[typing.Tuple[str, str, bool], typing.List[str]]" = OrderedDict()
+    _search_cache_lock = threading.Lock()
+
     def __init__(self, ontology_name: str = None, not_available: bool = False, not_applicable: bool = False, **kwargs):
         super().__init__(**kwargs)
         self._use_ols_cache_only = False
@@ -120,19 +218,36 @@ class OntologyTerm(_SeriesValidation):
         """
         return f"the term name or title can't be found in the ontology -- {self._ontology_name}"
 
+    @classmethod
+    def get_client(cls) -> OlsClient:
+        """
+        Return the OLS client shared by all the ontology validations, creating it the first time it is needed
+        :return: OlsClient
+        """
+        with OntologyTerm._client_lock:
+            if OntologyTerm._client is None:
+                OntologyTerm._client = OlsClient()
+        return OntologyTerm._client
+
+    @classmethod
+    def clear_search_cache(cls):
+        """
+        Forget the term searches shared by all the ontology validations, e.g. to validate against an updated OLS
+        """
+        with OntologyTerm._search_cache_lock:
+            OntologyTerm._search_cache.clear()
+
     @staticmethod
-    def validate_ontology_terms(cell_value, labels):
+    def validate_ontology_terms(cell_value: str, labels: typing.AbstractSet[str]) -> bool:
         """
-        Check if a cell value is in a list of labels or list of string
+        Check if a cell value is in a set of labels
         :param cell_value: line in a cell
-        :param labels: list of labels
+        :param labels: set of valid labels
         :return:
         """
         cell_value = cell_value.lower()
         term = ontology_term_parser(cell_value)
-        if term.get(TERM_NAME) in labels:
-            return True
-        return False
+        return term.get(TERM_NAME) in labels
 
     def validate(self, series: pd.Series) -> pd.Series:
         """
@@ -141,33 +256,63 @@ class OntologyTerm(_SeriesValidation):
         :param series: return series that do not match the criteria
         :return:
         """
-        terms = [ontology_term_parser(x) for x in series.unique()]
-        labels = []
-        for term in terms:
-            if TERM_NAME not in term:
-                ontology_terms = None
-            else:
-                if self._ontology_name is not None:
-                    ontology_terms = client.search(
-                        term[TERM_NAME],
-                        ontology=self._ontology_name,
-                        exact="true",
-                        use_ols_cache_only=self._use_ols_cache_only,
-                    )
-                else:
-                    ontology_terms = client.search(
-                        term=term[TERM_NAME], exact="true", use_cache_only=self._use_ols_cache_only
-                    )
-
-            if ontology_terms is not None:
-                query_labels = [o["label"].lower() for o in ontology_terms]
-                if term[TERM_NAME] in query_labels:
-                    labels.append(term[TERM_NAME])
+        codes, unique_values = pd.factorize(series)
+        terms = [ontology_term_parser(x) for x in unique_values]
+        # Several cells can share the same term name, search each name only once
+        term_names = list(dict.fromkeys(term[TERM_NAME] for term in terms if TERM_NAME in term))
+        client = self.get_client()
+        if self._use_ols_cache_only or len(term_names) < 2:
+            # The cache is queried through the shared duckdb connection, which must not be used concurrently
+            query_labels = [self._search_labels(term_name, client) for term_name in term_names]
+        else:
+            # Every OLS search is an HTTP round trip, overlap them instead of waiting for each one. The workers share
+            # the client and its requests.Session: the searches are plain GET requests that do not change the session
+            # state (cookies, headers or adapters), and the urllib3 connection pool it sends them through is
+            # thread-safe.
+            with ThreadPoolExecutor(max_workers=min(OLS_MAX_WORKERS, len(term_names))) as executor:
+                query_labels = list(executor.map(self._search_labels, term_names, [client] * len(term_names)))
+        labels = {term_name for term_name, found in zip(term_names, query_labels) if term_name in found}
         if self._not_available:
-            labels.append(NOT_AVAILABLE)
+            labels.add(NOT_AVAILABLE)
         if self._not_applicable:
-            labels.append(NOT_APPLICABLE)
-        return series.apply(lambda cell_value: self.validate_ontology_terms(cell_value, labels))
+            labels.add(NOT_APPLICABLE)
+        labels = frozenset(labels)
+        # Columns repeat the same values a lot, validate every distinct value once and map the result back to the cells.
+        # Most values are a bare term name, those are checked in one vectorised pass and only the key=value ones
+        # go through the parser.
+        values = pd.Series(unique_values, dtype=object)
+        key_value = values.str.contains("[;=]", na=False).to_numpy()
+        verdicts = values.str.lower().isin(labels).to_numpy()
+        verdicts[key_value] = [self.validate_ontology_terms(value, labels) for value in values[key_value]]
+        # Missing values are coded as -1, which picks the trailing False
+        return pd.Series(np.append(verdicts, False)[codes], index=series.index)
+
+    def _search_labels(self, term_name: str, client: OlsClient) -> typing.List[str]:
+        """
+        Search a term name in the ontology and return the labels found in lower case
+        :param term_name: name of the term
+        :param client: OLS client used for the search
+        :return: list of labels
+        """
+        key = (term_name, self._ontology_name, self._use_ols_cache_only)
+        with OntologyTerm._search_cache_lock:
+            labels = OntologyTerm._search_cache.get(key)
+            if labels is not None:
+                OntologyTerm._search_cache.move_to_end(key)
+                return labels
+        ontology_terms = client.search(
+            term_name, ontology=self._ontology_name, exact="true", use_ols_cache_only=self._use_ols_cache_only
+        )
+        labels = [o["label"].lower() for o in ontology_terms or []]
+        # OLS answers a failed request and an unknown term the same way, with no terms. Those searches are not cached
+        # so a later validation can try again, only the searches of the cache files are final.
+        if labels or self._use_ols_cache_only:
+            with OntologyTerm._search_cache_lock:
+                OntologyTerm._search_cache[key] = labels
+                OntologyTerm._search_cache.move_to_end(key)
+                if len(OntologyTerm._search_cache) > OLS_SEARCH_CACHE_SIZE:
+                    OntologyTerm._search_cache.popitem(last=False)
+        return labels
 
     def set_ols_strategy(self, use_ols_cache_only: bool = False):
         """
@@ -179,7 +324,7 @@ class OntologyTerm(_SeriesValidation):
 
 class SDRFSchema(Schema):
     _special_columns = {"sourcename", "assayname", "materialtype", "technologytype"}
-    _column_template = r"^(characteristics|comment|factor value)\s*\[([^\]]+)\](?:\.\d+)?$"
+    _column_template = re.compile(r"^(characteristics|comment|factor value)\s*\[([^\]]+)\](?:\.\d+)?$")
 
     def __init__(self, columns: typing.Iterable[SDRFColumn], ordered: bool = False, min_columns: int = 0):
         super().__init__(columns, ordered)
@@ -190,15 +335,16 @@ class SDRFSchema(Schema):
         obj._min_columns = min_columns
         return obj
 
-    def validate(self, panda_sdrf: sdrf = None, use_ols_cache_only: bool = False) -> typing.List[LogicError]:
+    def validate(
+        self, panda_sdrf: "sdrf.SdrfDataFrame" = None, use_ols_cache_only: bool = False
+    ) -> typing.List[LogicError]:
         errors = []
 
         # Check the minimum number of columns
         if check_minimum_columns(panda_sdrf, self._min_columns):
             error_message = (
-                "The number of columns in the SDRF ({}) is smaller than the number of mandatory fields ({})".format(
-                    len(panda_sdrf.get_sdrf_columns()), self._min_columns
-                )
+                f"The number of columns in the SDRF ({len(panda_sdrf.get_sdrf_columns())}) is smaller than the number "
+                f"of mandatory fields ({self._min_columns})"
             )
             errors.append(LogicError(error_message, error_type=logging.WARN))
 
@@ -234,20 +380,29 @@ class SDRFSchema(Schema):
         errors = []
         spaces = []
         logerror = []
-        for cname in panda_sdrf.columns:
-            if cname != cname.strip():
+        cnames = panda_sdrf.columns.tolist()
+        # Looked up for every factor value column, build it once
+        cnames_set = set(cnames)
+        # Leading or trailing whitespace, checked for all the column names at once
+        surrounded_by_spaces = (panda_sdrf.columns.str.strip() != panda_sdrf.columns).tolist()
+        for cname, has_spaces in zip(cnames, surrounded_by_spaces):
+            if has_spaces:
                 spaces.append(cname)
                 continue
             if cname.replace(" ", "") in self._special_columns:
                 continue
-            m = re.match(self._column_template, cname)
+            m = self._column_template.match(cname)
             if not m:
                 errors.append(cname)
-            elif m.group().startswith("factor value"):
-                if (
-                    m.group().replace("factor value", "comment") not in panda_sdrf.columns
-                    and m.group().replace("factor value", "characteristics") not in panda_sdrf.columns
-                    and m.group() not in panda_sdrf.columns
+                continue
+            column_name = m.group()
+            if column_name.startswith("factor value"):
+                if cnames_set.isdisjoint(
+                    (
+                        column_name.replace("factor value", "comment"),
+                        column_name.replace("factor value", "characteristics"),
+                        column_name,
+                    )
                 ):
                     error_message = "The " + cname + " column should also be in the characteristics or comment"
                     logerror.append(LogicError(error_message, error_type=logging.ERROR))
@@ -264,13 +419,14 @@ class SDRFSchema(Schema):
         return logerror
 
     def validate_mandatory_columns(self, panda_sdrf):
-        error_mandatory = []
-        for column in self.columns:
-            if column._optional is False and column.name not in panda_sdrf.get_sdrf_columns():
-                error_mandatory.append(column.name)
+        sdrf_columns = frozenset(panda_sdrf.get_sdrf_columns())
+        # Iterate the schema rather than taking a set difference, the missing columns are reported in schema order
+        error_mandatory = [
+            column.name for column in self.columns if column._optional is False and column.name not in sdrf_columns
+        ]
         if len(error_mandatory):
-            error_message = "The following columns are mandatory and not present in the SDRF: {}".format(
-                ", ".join(error_mandatory)
+            error_message = (
+                f"The following columns are mandatory and not present in the SDRF: {', '.join(error_mandatory)}"
             )
             return LogicError(error_message, error_type=logging.ERROR)
         return None
@@ -278,46 +434,51 @@ class SDRFSchema(Schema):
     @staticmethod
     def validate_columns_order(panda_sdrf):
         error_columns_order = []
-        if "assay name" in list(panda_sdrf):
-            cnames = list(panda_sdrf)
+        cnames = list(panda_sdrf)
+        if "assay name" in cnames:
             assay_index = cnames.index("assay name")
             factor_tag = False
+            # Factor columns followed by a comment or characteristics column, and the ones not yet followed by any
+            error = []
+            temp = []
             for idx, column in enumerate(cnames):
+                # Every column name is searched once for each token used by the checks below
+                is_comment = "comment" in column
+                is_characteristics = "characteristics" in column
+                is_factor = "factor value" in column
+                is_technology_type = "technology type" in column
                 error_message, error_type = "", None
                 if idx < assay_index:
-                    if "comment" in column:
+                    if is_comment:
                         error_message = "The column " + column + " cannot be before the assay name"
                         error_type = logging.ERROR
-                    if "technology type" in column:
+                    if is_technology_type:
                         error_message = "The column " + column + " must be immediately after the assay name"
                         if assay_index - idx > 1:
                             error_type = logging.ERROR
                         else:
                             error_type = logging.WARNING
                 else:
-                    if "characteristics" in column or ("material type" in column and "factor value" not in column):
+                    if is_characteristics or ("material type" in column and not is_factor):
                         error_message = "The column " + column + " cannot be after the assay name"
                         error_type = logging.ERROR
-                    if "technology type" in column and idx > assay_index + 1:
+                    if is_technology_type and idx > assay_index + 1:
                         error_message = "The column " + column + " must be immediately after the assay name"
                         error_type = logging.ERROR
                 if error_type is not None:
                     error_columns_order.append(LogicError(error_message, error_type=error_type))
-                if "factor value" in column and not factor_tag:
-                    factor_index = idx
+                if is_factor:
                     factor_tag = True
-            if factor_tag:
-                temp = []
-                error = []
-                for column in cnames[factor_index:]:
-                    if "comment" in column or "characteristics" in column:
+                # From the first factor value column onwards, factor columns must not be followed by other columns
+                if factor_tag:
+                    if is_comment or is_characteristics:
                         error.extend(temp)
                         temp = []
-                    elif "factor value" in column:
+                    elif is_factor:
                         temp.append(column)
-                if len(error):
-                    error_message = "The following factor column should be last: {}".format(", ".join(error))
-                    error_columns_order.append(LogicError(error_message, error_type=logging.ERROR))
+            if len(error):
+                error_message = f"The following factor column should be last: {', '.join(error)}"
+                error_columns_order.append(LogicError(error_message, error_type=logging.ERROR))
             if error_columns_order:
                 return error_columns_order
         return None
@@ -326,13 +487,15 @@ class SDRFSchema(Schema):
         column_pairs = []
         columns_to_pair = self.columns
         errors = []
+        # Plain set membership instead of going through the column index of the data frame for every schema column
+        sdrf_columns = frozenset(panda_sdrf.columns)
 
         for column in columns_to_pair:
-            if column.name not in panda_sdrf and column._optional is False:
+            if column.name in sdrf_columns:
+                column_pairs.append((panda_sdrf[column.name], column))
+            elif column._optional is False:
                 message = f"The column {column.name} is not present in the SDRF"
                 errors.append(LogicError(message, error_type=logging.ERROR))
-            elif column.name in panda_sdrf:
-                column_pairs.append((panda_sdrf[column.name], column))
         return column_pairs, errors
 
     def validate_columns(self, panda_sdrf, use_ols_cache_only: bool = False):
@@ -341,14 +504,17 @@ class SDRFSchema(Schema):
         for series, column in column_pairs:
             column.set_ols_strategy(use_ols_cache_only=use_ols_cache_only)
             errors += column.validate(series)
-        return sorted(errors, key=lambda e: e.row)
+        # Sort in place, the list is built here and copying it is not needed
+        errors.sort(key=attrgetter("row"))
+        return errors
 
     def check_recommendations(self, panda_sdrf):
         column_pairs, errors = self._get_column_pairs(panda_sdrf)
         warnings = []
         for series, column in column_pairs:
             warnings += column.validate_optional(series)
-        return sorted(warnings, key=lambda e: e.row)
+        warnings.sort(key=attrgetter("row"))
+        return warnings
 
     def validate_empty_cells(self, panda_sdrf):
         """
@@ -358,25 +524,19 @@ class SDRFSchema(Schema):
         """
         errors = []
 
-        def validate_string(cell_value):
-            return cell_value is not None and cell_value != "nan" and len(cell_value.strip()) > 0
-
-        if sys.version_info <= (3, 8):
-            # Use map for Python versions less than 3.8
-            validation_results = panda_sdrf.map(validate_string)
+        columns = [panda_sdrf.iloc[:, i] for i in range(panda_sdrf.shape[1])]
+        if panda_sdrf.size > EMPTY_CELLS_PARALLEL_THRESHOLD:
+            # The string operations on every column are independent, check large files with several threads
+            with ThreadPoolExecutor(max_workers=min(EMPTY_CELLS_MAX_WORKERS, len(columns))) as executor:
+                masks = list(executor.map(empty_cells_mask, columns))
         else:
-            # Use applymap for Python versions 3.8 and above
-            validation_results = panda_sdrf.applymap(validate_string)
-
-        # Get the indices where the validation fails
-        failed_indices = [
-            (row, col)
-            for row in validation_results.index
-            for col in validation_results.columns
-            if not validation_results.at[row, col]
-        ]
+            masks = [empty_cells_mask(column) for column in columns]
 
-        for row, col in failed_indices:
+        if not masks:
+            return errors
+        # Report the empty cells row by row, as they appear in the file
+        rows, cols = np.nonzero(np.column_stack(masks))
+        for row, col in zip(panda_sdrf.index[rows], panda_sdrf.columns[cols]):
             message = f"Empty value found Row: {row}, Column: {col}"
             errors.append(LogicError(message, error_type=logging.ERROR))
         return errors
@@ -470,8 +630,8 @@ human_schema = SDRFSchema(
             "characteristics[age]",
             [LeadingWhitespaceValidation(), TrailingWhitespaceValidation()],
             [
-                MatchesPatternValidation(
-                    r"(?:^(?:\d+y)?(?:\d+m)?(?:\d+d)?$)|(?:not available)|(?:not applicable)", case=False
+                SDRFPatternValidation(
+                    AGE_PATTERN, case=False, message=f'does not match the pattern "{AGE_PATTERN.pattern}"'
                 )
             ],
             allow_empty=True,
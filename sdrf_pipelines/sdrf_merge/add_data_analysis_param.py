@@ -8,6 +8,11 @@ from sdrf_pipelines.ols.ols import OlsClient
 from sdrf_pipelines.openms.unimod import UnimodDatabase
 from sdrf_pipelines.sdrf.sdrf import SdrfDataFrame
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Accessing ontologies and CVs
 unimod = UnimodDatabase()
 olsclient = OlsClient()
@@ -133,13 +138,13 @@ mod_columns = pd.DataFrame()
 overwritten = set()
 
 with open(r"param2sdrf.yml") as file:
-    param_mapping = yaml.safe_load(file)
+    param_mapping = yaml.load(file, Loader=SafeLoader)
     mapping = param_mapping["parameters"]
 
 
 # READ PARAMETERS FOR RUNNING WORKFLOW
 with open(r"params.yml") as file:
-    tparams_in = yaml.safe_load(file)
+    tparams_in = yaml.load(file, Loader=SafeLoader)
     params_in = tparams_in["params"]
     rawfiles = tparams_in["rawfiles"]
     fastafile = tparams_in["fastafile"]
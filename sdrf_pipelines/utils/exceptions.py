@@ -1,4 +1,5 @@
 import logging
+import sys
 
 from pandas_schema import ValidationWarning
 
@@ -16,16 +17,19 @@ __all__ = ["LogicError"]
 
 class LogicError(ValidationWarning):
     def __init__(self, message: str, value: str = None, row: int = -1, column: str = None, error_type: logging = None):
+        # Errors are reported for a handful of column names, share one string per name across all the errors
+        if isinstance(column, str):
+            column = sys.intern(column)
         super().__init__(message, value, row, column)
         self._error_type = error_type
+        # The severity never changes, resolve its name once instead of every time the error is printed
+        self._level_name = logging.getLevelName(error_type)
 
     def __str__(self) -> str:
         if self.row is not None and self.column is not None and self.value is not None:
-            return '{{row: {}, column: "{}"}}: "{}" {} -- {}'.format(
-                self.row, self.column, self.value, self.message, logging.getLevelName(self._error_type)
-            )
+            return f'{{row: {self.row}, column: "{self.column}"}}: "{self.value}" {self.message} -- {self._level_name}'
         else:
-            return f"{self.message} -- {logging.getLevelName(self._error_type)}"
+            return f"{self.message} -- {self._level_name}"
 
 
 class AppConfigException(AppException):
@@ -2,6 +2,28 @@ import tempfile
 from pathlib import Path
 
 import pytest
+import requests
+
+from sdrf_pipelines.ols.ols import OlsClient
+from sdrf_pipelines.openms.unimod import UnimodDatabase
+from sdrf_pipelines.sdrf.sdrf_schema import OntologyTerm
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-online", action="store_true", default=False, help="run the tests that query OLS")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "online: the test queries the OLS service over the network")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-online"):
+        return
+    skip_online = pytest.mark.skip(reason="queries OLS, use --run-online to run it")
+    for item in items:
+        if "online" in item.keywords:
+            item.add_marker(skip_online)
 
 
 @pytest.fixture(scope="function")
@@ -9,3 +31,40 @@ def on_tmpdir(monkeypatch):
     with tempfile.TemporaryDirectory() as tmp_path:
         monkeypatch.chdir(tmp_path)
         yield Path(tmp_path)
+
+
+@pytest.fixture(scope="session")
+def ols_client():
+    return OlsClient()
+
+
+@pytest.fixture(scope="session")
+def unimod():
+    return UnimodDatabase()
+
+
+@pytest.fixture(autouse=True)
+def ontology_term_state(monkeypatch):
+    """
+    Give every test its own OLS client and term searches in the ontology validations, so the results of a test do not
+    depend on the searches of the tests that ran before it.
+    """
+    monkeypatch.setattr(OntologyTerm, "_client", None)
+    OntologyTerm.clear_search_cache()
+    yield
+    OntologyTerm.clear_search_cache()
+
+
+@pytest.fixture(autouse=True)
+def no_ols_requests(request, monkeypatch):
+    """
+    Fail the tests that are not marked online as soon as they send a request to OLS, instead of letting them wait on
+    the network. pytest.fail is not an Exception, so the error handling of the OLS client does not swallow it.
+    """
+    if "online" in request.keywords:
+        return
+
+    def get(self, url, *args, **kwargs):
+        pytest.fail(f"Request to {url} from a test not marked online, validate with --use_ols_cache_only")
+
+    monkeypatch.setattr(requests.Session, "get", get)
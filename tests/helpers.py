@@ -1,4 +1,5 @@
 import difflib
+import filecmp
 import os
 from typing import List
 
@@ -6,8 +7,13 @@ from click import BaseCommand
 from click.testing import CliRunner
 from click.testing import Result
 
+from sdrf_pipelines.parse_sdrf import cli
+
 
 def compare_files(file1: os.PathLike, file2: os.PathLike) -> List[str]:
+    # Identical files are the common case, only build a diff when the contents differ
+    if filecmp.cmp(file1, file2, shallow=False):
+        return []
     with open(file1, "r") as hosts0:
         with open(file2, "r") as hosts1:
             diff = difflib.unified_diff(
@@ -34,3 +40,14 @@ def run_and_check_status_code(command: BaseCommand, args: List[str], status_code
         traceback.print_exception(*result.exc_info)
         raise Exception(f"Status code {result.exit_code} not {status_code}")
     return result
+
+
+def run_validate_sdrf(sdrf_file: os.PathLike, status_code: int = 0, use_ols_cache_only: bool = True) -> Result:
+    """
+    Run validate-sdrf on a file. The terms are checked against the OLS cache unless use_ols_cache_only is False,
+    which needs a test marked online.
+    """
+    args = ["validate-sdrf", "--sdrf_file", str(sdrf_file)]
+    if use_ols_cache_only:
+        args.append("--use_ols_cache_only")
+    return run_and_check_status_code(cli, args, status_code)
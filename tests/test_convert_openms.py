@@ -1,3 +1,4 @@
+from itertools import takewhile
 from pathlib import Path
 
 import pytest
@@ -8,6 +9,11 @@ from .helpers import compare_files
 from .helpers import run_and_check_status_code
 
 
+def _count_lines(path: Path) -> int:
+    with open(path, "r") as f:
+        return sum(1 for _ in f)
+
+
 def _check_output_existance(out_dir: Path, two_files=True, min_num_samples=6):
     min_lines = min_num_samples + 1
     files_in_dir = list(out_dir.iterdir())
@@ -15,16 +21,13 @@ def _check_output_existance(out_dir: Path, two_files=True, min_num_samples=6):
         assert (out_dir / "openms.tsv").exists(), files_in_dir
         assert (out_dir / "experimental_design.tsv").exists(), files_in_dir
         # Check that the files have at least 3 lines
-        with open(out_dir / "openms.tsv", "r") as f:
-            assert len(f.readlines()) >= min_lines, "openms.tsv is empty"
-        with open(out_dir / "experimental_design.tsv", "r") as f:
-            assert len(f.readlines()) > min_lines, "experimental_design.tsv is empty"
+        assert _count_lines(out_dir / "openms.tsv") >= min_lines, "openms.tsv is empty"
+        assert _count_lines(out_dir / "experimental_design.tsv") > min_lines, "experimental_design.tsv is empty"
 
     else:
         assert (out_dir / "openms.tsv").exists(), files_in_dir
         # Check that the files have at least 3 lines
-        with open(out_dir / "openms.tsv", "r") as f:
-            assert len(f.readlines()) > min_lines, "openms.tsv is empty"
+        assert _count_lines(out_dir / "openms.tsv") > min_lines, "openms.tsv is empty"
 
 
 def _check_output_file_extensions(out_dir: Path, expected_extension):
@@ -36,10 +39,11 @@ def _check_output_file_extensions(out_dir: Path, expected_extension):
     # FOR SOME REASON, this does not matter ...
     # assert all([file.endswith(expected_extension) for file in files]), str(files) + "\n" + str(content)
 
+    # Only the file section of the experimental design is needed, it ends at the first blank line
     with open(out_dir / "experimental_design.tsv", "r") as f:
-        content = f.readlines()
+        next(f)
+        content = list(takewhile(lambda line: line != "\n", f))
 
-    content = content[1 : content.index("\n")]
     files = [line.split("\t")[2] for line in content]
     assert all([file.endswith(expected_extension) for file in files]), str(files) + "\n" + str(content)
 
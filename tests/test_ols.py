@@ -0,0 +1,156 @@
+import pandas as pd
+
+from sdrf_pipelines.ols.ols import OlsClient
+from sdrf_pipelines.ols.ols import _read_owl_class_labels
+from sdrf_pipelines.ols.ols import _read_owl_class_labels_rdflib
+from sdrf_pipelines.ols.ols import get_obo_accession
+from sdrf_pipelines.ols.ols import read_obo_file
+from sdrf_pipelines.ols.ols import read_owl_file
+
+OWL_CONTENT = b"""<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF
+   xmlns:owl="http://www.w3.org/2002/07/owl#"
+   xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+   xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+>
+  <owl:Class rdf:about="http://www.ebi.ac.uk/efo/EFO_0000001">
+    <rdfs:label>Experimental Factor</rdfs:label>
+  </owl:Class>
+  <owl:Class rdf:about="http://purl.obolibrary.org/obo/UBERON_0002107">
+    <rdfs:label>Liver</rdfs:label>
+  </owl:Class>
+  <owl:Class rdf:about="http://purl.obolibrary.org/obo/UBERON_0000000"/>
+</rdf:RDF>
+"""
+
+OBO_CONTENT = b"""format-version: 1.2
+ontology: ms
+
+[Term]
+id: MS:1000031
+name: instrument model
+
+[Term]
+id: MS:1001911
+name: Q Exactive
+"""
+
+
+def test_get_obo_accession():
+    assert get_obo_accession("http://www.ebi.ac.uk/efo/EFO_0000001") == "EFO:0000001"
+    assert get_obo_accession("http://purl.obolibrary.org/obo/UBERON#UBERON_0002107") == "UBERON:0002107"
+    assert get_obo_accession("http://www.ebi.ac.uk/efo/not-an-accession") is None
+
+
+def test_read_owl_file(tmp_path):
+    owl_file = tmp_path / "efo.owl"
+    owl_file.write_bytes(OWL_CONTENT)
+    terms = read_owl_file(str(owl_file), ontology_name="efo")
+    assert sorted(terms, key=lambda term: term["accession"]) == [
+        {"accession": "EFO:0000001", "label": "Experimental Factor", "ontology": "efo"},
+        {"accession": "UBERON:0002107", "label": "Liver", "ontology": "efo"},
+    ]
+
+
+def test_read_owl_file_typed_resources(tmp_path):
+    owl_file = tmp_path / "efo.owl"
+    owl_file.write_bytes(
+        OWL_CONTENT.replace(
+            b"</rdf:RDF>",
+            b"""  <rdf:Description rdf:about="http://www.ebi.ac.uk/efo/EFO_0000002">
+    <rdf:type rdf:resource="http://www.w3.org/2002/07/owl#Class"/>
+  </rdf:Description>
+  <rdf:Description rdf:about="http://www.ebi.ac.uk/efo/EFO_0000002">
+    <rdfs:label>Disease</rdfs:label>
+  </rdf:Description>
+</rdf:RDF>""",
+        )
+    )
+    terms = read_owl_file(str(owl_file), ontology_name="efo")
+    assert {"accession": "EFO:0000002", "label": "Disease", "ontology": "efo"} in terms
+    assert len(terms) == 3
+
+
+def test_read_owl_file_xml_literal_label(tmp_path):
+    owl_file = tmp_path / "efo.owl"
+    owl_file.write_bytes(
+        OWL_CONTENT.replace(
+            b"<rdfs:label>Liver</rdfs:label>",
+            b'<rdfs:label rdf:parseType="Literal">Liver <b xmlns="http://www.w3.org/1999/xhtml">tissue</b></rdfs:label>',
+        )
+    )
+    terms = read_owl_file(str(owl_file), ontology_name="efo")
+    [liver] = [term for term in terms if term["accession"] == "UBERON:0002107"]
+    assert "tissue" in liver["label"]
+
+
+def test_read_owl_file_with_entities(tmp_path):
+    owl_file = tmp_path / "efo.owl"
+    owl_file.write_bytes(
+        OWL_CONTENT.replace(
+            b"<rdf:RDF",
+            b'<!DOCTYPE rdf:RDF [<!ENTITY efo "http://www.ebi.ac.uk/efo/">]>\n<rdf:RDF',
+        ).replace(b'rdf:about="http://www.ebi.ac.uk/efo/', b'rdf:about="&efo;')
+    )
+    terms = read_owl_file(str(owl_file), ontology_name="efo")
+    assert {"accession": "EFO:0000001", "label": "Experimental Factor", "ontology": "efo"} in terms
+    assert len(terms) == 2
+
+
+def test_read_owl_file_repeated_labels(tmp_path):
+    owl_file = tmp_path / "efo.owl"
+    owl_file.write_bytes(
+        OWL_CONTENT.replace(
+            b"<rdfs:label>Liver</rdfs:label>",
+            b"""<rdfs:label>Liver</rdfs:label>
+    <rdfs:label>Liver</rdfs:label>
+    <rdfs:label xml:lang="en">Liver</rdfs:label>
+    <rdfs:label xml:lang="EN">Liver</rdfs:label>
+    <rdfs:label rdf:datatype="http://www.w3.org/2001/XMLSchema#string">Liver</rdfs:label>
+    <rdfs:label xml:lang="en" rdf:datatype="http://www.w3.org/2001/XMLSchema#string">Liver</rdfs:label>""",
+        ).replace(
+            b"</rdf:RDF>",
+            b"""  <rdf:Description rdf:about="http://purl.obolibrary.org/obo/UBERON_0002107" xml:lang="en">
+    <rdfs:label>Liver</rdfs:label>
+    <rdfs:label>Hepar</rdfs:label>
+  </rdf:Description>
+  <rdf:Description rdf:about="http://www.ebi.ac.uk/efo/EFO_0000001" rdfs:label="Experimental Factor"/>
+</rdf:RDF>""",
+        )
+    )
+    labels = _read_owl_class_labels(str(owl_file))
+    rdflib_labels = _read_owl_class_labels_rdflib(str(owl_file))
+    assert {iri: sorted(names) for iri, names in labels.items()} == {
+        iri: sorted(names) for iri, names in rdflib_labels.items()
+    }
+    assert sorted(labels["http://purl.obolibrary.org/obo/UBERON_0002107"]) == ["Hepar", "Liver", "Liver", "Liver"]
+    assert labels["http://www.ebi.ac.uk/efo/EFO_0000001"] == ["Experimental Factor"]
+
+
+def test_read_obo_file(tmp_path):
+    obo_file = tmp_path / "ms.obo"
+    obo_file.write_bytes(OBO_CONTENT)
+    assert read_obo_file(str(obo_file)) == [
+        {"accession": "MS:1000031", "label": "instrument model", "ontology": "ms"},
+        {"accession": "MS:1001911", "label": "Q Exactive", "ontology": "ms"},
+    ]
+
+
+def test_build_ontology_index_owl(tmp_path):
+    owl_file = tmp_path / "efo.owl"
+    owl_file.write_bytes(OWL_CONTENT)
+    output_file = tmp_path / "efo.parquet"
+    OlsClient.build_ontology_index(str(owl_file), str(output_file), ontology_name="EFO")
+    df = pd.read_parquet(output_file).sort_values("accession")
+    assert df["accession"].tolist() == ["efo:0000001", "uberon:0002107"]
+    assert df["label"].tolist() == ["experimental factor", "liver"]
+    assert df["ontology"].tolist() == ["efo", "efo"]
+
+
+def test_build_ontology_index_obo(tmp_path):
+    obo_file = tmp_path / "ms.obo"
+    obo_file.write_bytes(OBO_CONTENT)
+    OlsClient.build_ontology_index(str(obo_file))
+    df = pd.read_parquet(tmp_path / "ms.parquet")
+    assert df["accession"].tolist() == ["ms:1000031", "ms:1001911"]
+    assert df["label"].tolist() == ["instrument model", "q exactive"]
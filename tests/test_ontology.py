@@ -1,16 +1,64 @@
+import pytest
+
 from sdrf_pipelines.ols.ols import OlsClient
 
+HOMO_SAPIENS_RESPONSE = {
+    "response": {
+        "numFound": 1,
+        "docs": [{"iri": "http://purl.obolibrary.org/obo/NCBITaxon_9606", "label": "Homo sapiens"}],
+    }
+}
+
+
+class OlsResponse:
+    status_code = 200
+
+    def __init__(self, content):
+        self._content = content
+
+    def json(self):
+        return self._content
+
+
+@pytest.fixture
+def offline_ols_client(monkeypatch):
+    client = OlsClient()
+    requests = []
+
+    def get(url, params=None):
+        requests.append((url, dict(params)))
+        return OlsResponse(HOMO_SAPIENS_RESPONSE)
+
+    monkeypatch.setattr(client.session, "get", get)
+    client.requests = requests
+    return client
+
+
+def test_ontology_offline(offline_ols_client):
+    ontology_list = offline_ols_client.ols_search("homo sapiens", ontology="NCBITaxon", exact=True)
+    assert [term["label"] for term in ontology_list] == ["Homo sapiens"]
+    [(url, params)] = offline_ols_client.requests
+    assert url == "https://www.ebi.ac.uk/ols4/api/search"
+    assert params["q"] == "homo sapiens"
+    assert params["ontology"] == "ncbitaxon"
+    assert params["exact"] == "on"
+
+
+def test_search_offline(offline_ols_client):
+    ontology_list = offline_ols_client.search("homo sapiens", ontology="NCBITaxon", exact="true")
+    assert [term["label"] for term in ontology_list] == ["Homo sapiens"]
+
 
-def test_ontology():
-    ols = OlsClient()
-    ontology_list = ols.ols_search("homo sapiens", ontology="NCBITaxon")
+@pytest.mark.online
+def test_ontology(ols_client):
+    ontology_list = ols_client.ols_search("homo sapiens", ontology="NCBITaxon")
     print(ontology_list)
     assert len(ontology_list) > 0
 
 
-def test_ontology_cache():
-    ols = OlsClient()
-    ontology_list = ols.ols_search(
+@pytest.mark.online
+def test_ontology_cache(ols_client):
+    ontology_list = ols_client.ols_search(
         "homo sapiens",
         ontology="NCBITaxon",
     )
@@ -18,8 +66,7 @@ def test_ontology_cache():
     assert len(ontology_list) > 0
 
 
-def test_ontology_from_cache():
-    ols = OlsClient()
-    ontology_list = ols.cache_search("homo sapiens", ontology="NCBITaxon")
+def test_ontology_from_cache(ols_client):
+    ontology_list = ols_client.cache_search("homo sapiens", ontology="NCBITaxon")
     print(ontology_list)
     assert len(ontology_list) > 0
@@ -0,0 +1,162 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from sdrf_pipelines.sdrf import sdrf_schema
+from sdrf_pipelines.sdrf.sdrf import SdrfDataFrame
+from sdrf_pipelines.sdrf.sdrf_schema import AGE_PATTERN
+from sdrf_pipelines.sdrf.sdrf_schema import MASS_SPECTROMETRY
+from sdrf_pipelines.sdrf.sdrf_schema import LeadingWhitespaceValidation
+from sdrf_pipelines.sdrf.sdrf_schema import OntologyTerm
+from sdrf_pipelines.sdrf.sdrf_schema import SDRFColumn
+from sdrf_pipelines.sdrf.sdrf_schema import SDRFPatternValidation
+from sdrf_pipelines.sdrf.sdrf_schema import TrailingWhitespaceValidation
+from sdrf_pipelines.sdrf.sdrf_schema import default_schema
+from sdrf_pipelines.sdrf.sdrf_schema import ontology_term_parser
+
+trailing_whitespace_values = [
+    ("homo sapiens", True),
+    ("homo sapiens ", False),
+    ("homo sapiens\t", False),
+    ("homo sapiens\n", False),
+    (" homo sapiens", True),
+    ("homo  sapiens", True),
+    ("", True),
+]
+
+
+@pytest.mark.parametrize("value,valid", trailing_whitespace_values)
+def test_trailing_whitespace_validation(value, valid):
+    assert TrailingWhitespaceValidation().validate(pd.Series([value])).tolist() == [valid]
+
+
+leading_whitespace_values = [
+    ("homo sapiens", True),
+    (" homo sapiens", False),
+    ("\thomo sapiens", False),
+    ("homo sapiens ", True),
+    ("", True),
+]
+
+
+@pytest.mark.parametrize("value,valid", leading_whitespace_values)
+def test_leading_whitespace_validation(value, valid):
+    assert LeadingWhitespaceValidation().validate(pd.Series([value])).tolist() == [valid]
+
+
+surrounding_whitespace_values = [
+    ("Homo sapiens", []),
+    ("  Homo sapiens  ", ["contains leading whitespace", "contains trailing whitespace"]),
+    ("Homo\tsapiens", []),
+    ("Homo sapiens\n", ["contains trailing whitespace"]),
+]
+
+
+@pytest.mark.parametrize("value,messages", surrounding_whitespace_values)
+def test_whitespace_validations(value, messages):
+    column = SDRFColumn("characteristics[organism]", [LeadingWhitespaceValidation(), TrailingWhitespaceValidation()])
+    errors = column.validate(pd.Series([value], name="characteristics[organism]"))
+    assert [error.message for error in errors] == messages
+
+
+def test_trailing_whitespace_validation_repeated_values():
+    series = pd.Series(["label free ", "label free", None, "label free ", "label free"], index=[4, 3, 2, 1, 0])
+    result = TrailingWhitespaceValidation().validate(series)
+    assert result.index.tolist() == [4, 3, 2, 1, 0]
+    assert result.tolist() == [False, True, True, False, True]
+
+
+def test_pattern_validation_repeated_values():
+    series = pd.Series(["30Y", "not available", None, "30Y", "2y6m"], index=[4, 3, 2, 1, 0])
+    result = SDRFPatternValidation(AGE_PATTERN).validate(series)
+    assert result.index.tolist() == [4, 3, 2, 1, 0]
+    assert result.tolist() == [False, True, False, False, True]
+
+
+@pytest.mark.parametrize("missing", [None, float("nan"), pd.NA])
+def test_pattern_validation_missing_values(missing):
+    series = pd.Series(["30Y", missing, "None", "nan", "<NA>"], dtype=object)
+    expected = series.astype(str).str.contains("^(?:None|nan|<NA>)$").tolist()
+    assert SDRFPatternValidation("^(?:None|nan|<NA>)$").validate(series).tolist() == expected
+
+
+def test_ontology_term_validation_repeated_values():
+    validation = OntologyTerm("ms", not_available=True)
+    validation.set_ols_strategy(use_ols_cache_only=True)
+    series = pd.Series(["not available", "NT=not available", "not available", "not a term"], index=[3, 1, 2, 0])
+    result = validation.validate(series)
+    assert result.index.tolist() == [3, 1, 2, 0]
+    assert result.tolist() == [True, True, True, False]
+
+
+def test_ontology_term_parser():
+    assert ontology_term_parser("Homo sapiens") == {"NT": "homo sapiens"}
+    assert ontology_term_parser("NT=Oxidation;AC=UNIMOD:35;TA=M") == {"NT": "oxidation", "AC": "unimod:35", "TA": "m"}
+    with pytest.raises(ValueError):
+        ontology_term_parser("NT=Oxidation;UNIMOD:35")
+
+
+def test_validate_empty_cells():
+    df = pd.DataFrame({"source name": ["sample 1", " ", None], "assay name": ["nan", "run 2", ""]})
+    errors = [error.message for error in default_schema.validate_empty_cells(df)]
+    assert errors == [
+        "Empty value found Row: 0, Column: assay name",
+        "Empty value found Row: 1, Column: source name",
+        "Empty value found Row: 2, Column: source name",
+        "Empty value found Row: 2, Column: assay name",
+    ]
+
+
+def test_ontology_term_searches_shared_between_validations():
+    series = pd.Series(["homo sapiens", "not a term"])
+    first = OntologyTerm("ncbitaxon")
+    first.set_ols_strategy(use_ols_cache_only=True)
+    assert first.validate(series).tolist() == [True, False]
+    assert OntologyTerm._search_cache[("homo sapiens", "ncbitaxon", True)] == ["homo sapiens"]
+
+    second = OntologyTerm("ncbitaxon")
+    second.set_ols_strategy(use_ols_cache_only=True)
+    assert second.validate(series).tolist() == [True, False]
+
+
+def test_ontology_term_failed_searches_not_cached(monkeypatch):
+    validation = OntologyTerm("ncbitaxon")
+    client = OntologyTerm.get_client()
+    # ols_search reports a request that failed after all the retries as no terms found
+    monkeypatch.setattr(client, "ols_search", lambda *args, **kwargs: [])
+    assert validation.validate(pd.Series(["homo sapiens"])).tolist() == [False]
+    assert OntologyTerm._search_cache == {}
+
+    monkeypatch.setattr(client, "ols_search", lambda *args, **kwargs: [{"label": "Homo sapiens"}])
+    assert validation.validate(pd.Series(["homo sapiens"])).tolist() == [True]
+    assert OntologyTerm._search_cache[("homo sapiens", "ncbitaxon", False)] == ["homo sapiens"]
+
+
+def test_ontology_term_search_cache_bounded(monkeypatch):
+    monkeypatch.setattr(sdrf_schema, "OLS_SEARCH_CACHE_SIZE", 2)
+    validation = OntologyTerm("ncbitaxon")
+    validation.set_ols_strategy(use_ols_cache_only=True)
+    validation.validate(pd.Series(["homo sapiens", "mus musculus"]))
+    validation.validate(pd.Series(["homo sapiens", "not a term"]))
+    assert list(OntologyTerm._search_cache) == [
+        ("homo sapiens", "ncbitaxon", True),
+        ("not a term", "ncbitaxon", True),
+    ]
+
+    OntologyTerm.clear_search_cache()
+    assert not OntologyTerm._search_cache
+
+
+def test_ontology_term_client_created_once():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: OntologyTerm.get_client(), range(8)))
+    assert all(client is clients[0] for client in clients)
+
+
+def test_validate_large_sdrf(shared_datadir):
+    # The checks work on whole columns, a reference SDRF repeated to ~10k rows must still validate quickly and cleanly
+    sdrf = SdrfDataFrame.parse(str(shared_datadir / "reference/PXD002137/PXD002137.sdrf.tsv"))
+    large_sdrf = SdrfDataFrame(pd.concat([sdrf] * 50, ignore_index=True))
+    assert large_sdrf.validate("default", use_ols_cache_only=True) == []
+    assert large_sdrf.validate(MASS_SPECTROMETRY, use_ols_cache_only=True) == []
@@ -1,8 +1,15 @@
 import pytest
 
+from sdrf_pipelines import __version__
 from sdrf_pipelines.parse_sdrf import cli
 
 from .helpers import run_and_check_status_code
+from .helpers import run_validate_sdrf
+
+
+def test_version():
+    result = run_and_check_status_code(cli, ["--version"])
+    assert result.output == f"sdrf_pipelines {__version__}\n"
 
 
 def test_validate_srdf_errors_on_bad_file(shared_datadir, on_tmpdir):
@@ -10,7 +17,7 @@ def test_validate_srdf_errors_on_bad_file(shared_datadir, on_tmpdir):
     :return:
     """
     test_sdrf = shared_datadir / "erroneous/PXD000288/PXD000288.sdrf.tsv"
-    result = run_and_check_status_code(cli, ["validate-sdrf", "--sdrf_file", str(test_sdrf)], 1)
+    result = run_validate_sdrf(test_sdrf, 1)
 
     expected_error = (
         "The following columns are mandatory and not present in the SDRF: comment[technical replicate] -- ERROR"
@@ -24,7 +31,7 @@ def test_validate_srdf_fails_on_bad_file2(shared_datadir, on_tmpdir):
     :return:
     """
     test_sdrf = shared_datadir / "PXD001819/PXD001819.sdrf.tsv"
-    result = run_and_check_status_code(cli, ["validate-sdrf", "--sdrf_file", str(test_sdrf)], 1)
+    result = run_validate_sdrf(test_sdrf, 1)
 
     expected_error = "The following columns are mandatory and not present in the SDRF: characteristics[biological replicate] -- ERROR"
     assert expected_error in result.output, result.output
@@ -35,7 +42,7 @@ def test_validate_srdf_fails_on_bad_file3(shared_datadir, on_tmpdir):
     :return:
     """
     test_sdrf = shared_datadir / "erroneous/example.sdrf.tsv"
-    result = run_and_check_status_code(cli, ["validate-sdrf", "--sdrf_file", str(test_sdrf)], 1)
+    result = run_validate_sdrf(test_sdrf, 1)
 
     expected_errors = [
         "Make sure your SDRF have a sample characteristics or data comment 'concentration of' for your factor value column 'factor value[concentration of]' -- ERROR",
@@ -45,6 +52,17 @@ def test_validate_srdf_fails_on_bad_file3(shared_datadir, on_tmpdir):
         assert expected_error in result.output, result.output
 
 
+def test_validate_srdf_reports_errors_once(shared_datadir, on_tmpdir):
+    """
+    :return:
+    """
+    test_sdrf = shared_datadir / "erroneous/PXD000288/PXD000288.sdrf.tsv"
+    result = run_validate_sdrf(test_sdrf, 1)
+
+    errors = result.output.splitlines()
+    assert len(errors) == len(set(errors)), result.output
+
+
 reference_samples = [
     "reference/PXD002137/PXD002137.sdrf.tsv",
     "reference/PDC000126/PDC000126.sdrf.tsv",
@@ -54,11 +72,22 @@ reference_samples = [
 ]
 
 
+@pytest.mark.online
 @pytest.mark.parametrize("file_subpath", reference_samples)
 def test_on_reference_sdrf(file_subpath, shared_datadir, on_tmpdir):
     """
     :return:
     """
     test_sdrf = shared_datadir / file_subpath
-    result = run_and_check_status_code(cli, ["validate-sdrf", "--sdrf_file", str(test_sdrf)])
+    result = run_validate_sdrf(test_sdrf, use_ols_cache_only=False)
+    assert "ERROR" not in result.output.upper(), result.output
+
+
+@pytest.mark.parametrize("file_subpath", reference_samples)
+def test_on_reference_sdrf_with_ols_cache(file_subpath, shared_datadir, on_tmpdir):
+    """
+    :return:
+    """
+    test_sdrf = shared_datadir / file_subpath
+    result = run_validate_sdrf(test_sdrf)
     assert "ERROR" not in result.output.upper(), result.output
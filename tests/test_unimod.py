@@ -1,18 +1,24 @@
 from sdrf_pipelines.openms.unimod import UnimodDatabase
 
 
-def test_search_mods_by_accession():
-    unimod = UnimodDatabase()
+def test_search_mods_by_accession(unimod):
     ptm = unimod.get_by_accession("UNIMOD:21")
     print(ptm.get_name())
 
 
-def test_search_mods_by_keyword():
-    unimod = UnimodDatabase()
+def test_search_mods_by_keyword(unimod):
     ptms = unimod.search_mods_by_keyword("Phospho")
     for ptm in ptms:
         print(ptm.to_str())
 
 
+def test_search_mods_lookups(unimod):
+    assert unimod.get_by_accession("UNIMOD:21").get_name() == "Phospho"
+    assert unimod.get_by_accession("UNIMOD:0000") is None
+    names = [ptm.get_name() for ptm in unimod.search_mods_by_keyword("phospho")]
+    assert "Phospho" in names
+    assert len(names) > 1
+
+
 if __name__ == "__main__":
-    test_search_mods_by_keyword()
+    test_search_mods_by_keyword(UnimodDatabase())